@@ -0,0 +1,210 @@
+import os
+import struct
+
+# Tabel bitrate (kbps) MPEG audio, diindeks [versi MPEG1?][layer][indeks bitrate]
+_BITRATES = {
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+# Sample rate per versi MPEG (bit versi di header: 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5)
+_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+# Bagian awal file yang dibaca untuk mencari frame pertama
+_SCAN_BYTES = 64 * 1024
+# Frame teks ID3v2 yang dibaca read_tags (v2.3/v2.4 dan v2.2)
+_TAG_FRAMES = {
+    b"TIT2": "title", b"TPE1": "artist", b"TCON": "genre",
+    b"TT2": "title", b"TP1": "artist", b"TCO": "genre",
+}
+_TEXT_ENCODINGS = {0: "latin-1", 1: "utf-16", 2: "utf-16-be", 3: "utf-8"}
+
+
+def _id3v2_size(header):
+    """Ukuran tag ID3v2 di awal file (0 bila tidak ada)"""
+    if len(header) < 10 or header[:3] != b"ID3":
+        return 0
+    size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _decode_text_frame(body):
+    """Decode isi frame teks ID3 (byte pertama = encoding)"""
+    if not body:
+        return ""
+    encoding = _TEXT_ENCODINGS.get(body[0], "latin-1")
+    try:
+        text = body[1:].decode(encoding)
+    except UnicodeDecodeError:
+        return ""
+    # Frame bisa berisi beberapa nilai dipisah NUL; ambil yang pertama
+    return text.split("\x00")[0].strip()
+
+
+def read_tags(file_path):
+    """Baca title/artist/genre dari tag ID3v2; kembalikan dict (bisa kosong).
+
+    Frame yang besar (mis. gambar cover) dilewati dengan seek, tidak dibaca.
+    """
+    tags = {}
+    try:
+        with open(file_path, "rb") as f:
+            header = f.read(10)
+            tag_end = _id3v2_size(header)
+            if not tag_end:
+                return tags
+            version = header[3]
+            if header[5] & 0x40 and version >= 3:
+                # Lewati extended header
+                ext = f.read(4)
+                ext_size = struct.unpack(">I", ext)[0]
+                if version == 4:
+                    ext_size = (ext[0] << 21) | (ext[1] << 14) | (ext[2] << 7) | ext[3]
+                    f.seek(ext_size - 4, os.SEEK_CUR)
+                else:
+                    f.seek(ext_size, os.SEEK_CUR)
+
+            id_len, header_len = (3, 6) if version == 2 else (4, 10)
+            while f.tell() + header_len <= tag_end and len(tags) < 3:
+                frame_header = f.read(header_len)
+                frame_id = frame_header[:id_len]
+                if not frame_id.strip(b"\x00"):
+                    break  # Padding: tidak ada frame lagi
+                size_bytes = frame_header[id_len:id_len + (3 if version == 2 else 4)]
+                if version == 4:
+                    size = (size_bytes[0] << 21) | (size_bytes[1] << 14) | (size_bytes[2] << 7) | size_bytes[3]
+                else:
+                    size = int.from_bytes(size_bytes, "big")
+                key = _TAG_FRAMES.get(frame_id)
+                if key and key not in tags:
+                    value = _decode_text_frame(f.read(size))
+                    if value:
+                        tags[key] = value
+                else:
+                    f.seek(size, os.SEEK_CUR)
+    except (OSError, struct.error, IndexError):
+        pass
+    return tags
+
+
+def _parse_frame_header(data, pos):
+    """Parse header frame MPEG di `pos`; kembalikan dict info atau None bila tidak valid"""
+    if pos + 4 > len(data) or data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    version = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    layer = 4 - layer_bits
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    padding = (b2 >> 1) & 0x01
+    if layer == 1:
+        samples = 384
+        frame_length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or mpeg1) else 576
+        frame_length = samples // 8 * bitrate // sample_rate + padding
+
+    return {
+        "mpeg1": mpeg1,
+        "mono": (b3 >> 6) == 3,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "samples": samples,
+        "frame_length": frame_length,
+    }
+
+
+def _find_first_frame(data, start):
+    """Cari frame pertama yang valid (dikonfirmasi oleh header frame berikutnya)"""
+    pos = data.find(b"\xff", start)
+    while pos != -1 and pos + 4 <= len(data):
+        info = _parse_frame_header(data, pos)
+        if info and info["frame_length"] > 0:
+            next_pos = pos + info["frame_length"]
+            # Header sinkronisasi palsu bisa muncul di data; pastikan frame berikutnya juga valid
+            if next_pos + 4 > len(data) or _parse_frame_header(data, next_pos):
+                return pos, info
+        pos = data.find(b"\xff", pos + 1)
+    return None, None
+
+
+def read_mp3_duration(file_path):
+    """Hitung durasi MP3 (detik) dari header frame dan tag Xing/Info/VBRI tanpa decode audio"""
+    try:
+        file_size = os.path.getsize(file_path)
+        with open(file_path, "rb") as f:
+            header = f.read(10)
+            audio_start = _id3v2_size(header)
+            f.seek(audio_start)
+            data = f.read(_SCAN_BYTES)
+            f.seek(max(0, file_size - 128))
+            has_id3v1 = f.read(3) == b"TAG"
+    except OSError:
+        return 0.0
+
+    pos, info = _find_first_frame(data, 0)
+    if info is None:
+        return 0.0
+
+    # Header VBR Xing/Info berada setelah side information frame pertama
+    if info["mpeg1"]:
+        side_info = 17 if info["mono"] else 32
+    else:
+        side_info = 9 if info["mono"] else 17
+    xing = pos + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info") and len(data) >= xing + 12:
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if flags & 0x01:
+            frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+            return frames * info["samples"] / info["sample_rate"]
+
+    # Header VBR Fraunhofer (VBRI) selalu 32 byte setelah header frame
+    vbri = pos + 4 + 32
+    if data[vbri:vbri + 4] == b"VBRI" and len(data) >= vbri + 18:
+        frames = struct.unpack(">I", data[vbri + 14:vbri + 18])[0]
+        return frames * info["samples"] / info["sample_rate"]
+
+    # CBR: durasi = ukuran audio / bitrate
+    audio_bytes = file_size - audio_start - pos - (128 if has_id3v1 else 0)
+    return audio_bytes * 8 / info["bitrate"]
+
+
+def read_wav_duration(file_path):
+    """Hitung durasi WAV (detik) dari chunk fmt dan data"""
+    try:
+        with open(file_path, "rb") as f:
+            if f.read(12)[8:12] != b"WAVE":
+                return 0.0
+            byte_rate = 0
+            while True:
+                chunk = f.read(8)
+                if len(chunk) < 8:
+                    return 0.0
+                chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+                if chunk_id == b"fmt ":
+                    byte_rate = struct.unpack("<I", f.read(size)[8:12])[0]
+                elif chunk_id == b"data":
+                    return size / byte_rate if byte_rate else 0.0
+                else:
+                    f.seek(size + (size & 1), os.SEEK_CUR)
+    except (OSError, struct.error):
+        return 0.0
+
+
+def read_duration(file_path):
+    """Durasi file audio (detik) dari header-nya; 0.0 bila format tidak dikenali"""
+    if not file_path or not os.path.exists(file_path):
+        return 0.0
+    if file_path.lower().endswith(".wav"):
+        return read_wav_duration(file_path)
+    return read_mp3_duration(file_path)
@@ -0,0 +1,64 @@
+import contextlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+# Benchmark dijalankan dari folder mana pun: pastikan modul aplikasi bisa di-import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+import models  # noqa: E402
+import storage  # noqa: E402
+
+_SYLLABLES = ["ka", "ri", "mo", "na", "lu", "se", "ta", "vi", "do", "pe", "ra", "zu", "me", "lo", "shi", "an"]
+
+
+@contextlib.contextmanager
+def temp_data_manager(backend="json"):
+    """`DataManager` kosong yang menyimpan datanya di folder sementara (dihapus setelah selesai)"""
+    data_dir = tempfile.mkdtemp(prefix="spotipai-bench-")
+    paths = {
+        "DATA_DIR": data_dir,
+        "SONGS_FILE": os.path.join(data_dir, "songs.json"),
+        "USERS_FILE": os.path.join(data_dir, "users.json"),
+        "JOURNAL_FILE": os.path.join(data_dir, "journal.log"),
+        "DATABASE_FILE": os.path.join(data_dir, "spotipai.db"),
+        "HISTORY_DIR": os.path.join(data_dir, "history"),
+        "STORAGE_BACKEND": backend,
+    }
+    # Modul meng-import konstanta config langsung, jadi nilainya diganti di setiap modul
+    saved = []
+    for module in (config, storage, models):
+        for name, value in paths.items():
+            if hasattr(module, name):
+                saved.append((module, name, getattr(module, name)))
+                setattr(module, name, value)
+    manager = models.DataManager()
+    try:
+        yield manager
+    finally:
+        manager.close()
+        for module, name, value in saved:
+            setattr(module, name, value)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def random_word(rng, min_syllables=2, max_syllables=4):
+    """Kata acak dari gabungan suku kata (mirip nama lagu/artis)"""
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(min_syllables, max_syllables)))
+
+
+def random_songs(count, seed=0, artists=None, genres=20):
+    """Daftar entri lagu untuk `DataManager.add_songs` (durasi diisi agar file tidak dibaca)"""
+    rng = random.Random(seed)
+    artists = artists or max(1, count // 40)
+    artist_names = [f"{random_word(rng).title()} {random_word(rng).title()}" for _ in range(artists)]
+    genre_names = [random_word(rng, 2, 3).title() for _ in range(genres)]
+    return [{
+        "title": " ".join(random_word(rng).title() for _ in range(rng.randint(1, 4))),
+        "artist": rng.choice(artist_names),
+        "genre": rng.choice(genre_names),
+        "duration": rng.uniform(90, 360),
+    } for _ in range(count)]
@@ -0,0 +1,69 @@
+"""Mutasi katalog massal: API batch vs panggilan per lagu.
+
+Setiap skenario memakai katalog baru dan waktu yang diukur sudah termasuk
+`flush()`, yaitu sampai semua mutasi tertulis ke storage.
+
+    python benchmarks/bench_batch_mutations.py [--songs 5000] [--backend json|sqlite]
+"""
+import argparse
+import time
+
+from _data import random_songs, temp_data_manager
+
+
+def timed(dm, action):
+    start = time.perf_counter()
+    action()
+    dm.flush()
+    return time.perf_counter() - start
+
+
+def run(entries, backend):
+    results = {}
+
+    with temp_data_manager(backend) as dm:
+        ids = []
+        add = timed(dm, lambda: ids.extend(
+            dm.add_song(e["title"], e["artist"], e["genre"], duration=e["duration"]) for e in entries))
+        update = timed(dm, lambda: [dm.update_song(song_id, genre="Pop") for song_id in ids])
+        delete = timed(dm, lambda: [dm.delete_song(song_id) for song_id in ids])
+        results["per lagu"] = (add, update, delete)
+
+    with temp_data_manager(backend) as dm:
+        ids = []
+        add = timed(dm, lambda: ids.extend(dm.add_songs(entries)))
+        update = timed(dm, lambda: dm.update_songs({"song_id": song_id, "genre": "Pop"} for song_id in ids))
+        delete = timed(dm, lambda: dm.delete_songs(ids))
+        results["add/update/delete_songs"] = (add, update, delete)
+
+    with temp_data_manager(backend) as dm:
+        ids = []
+
+        def in_batch(action):
+            with dm.batch():
+                action()
+
+        add = timed(dm, lambda: in_batch(lambda: ids.extend(
+            dm.add_song(e["title"], e["artist"], e["genre"], duration=e["duration"]) for e in entries)))
+        update = timed(dm, lambda: in_batch(lambda: [dm.update_song(song_id, genre="Pop") for song_id in ids]))
+        delete = timed(dm, lambda: in_batch(lambda: [dm.delete_song(song_id) for song_id in ids]))
+        results["per lagu di batch()"] = (add, update, delete)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--songs", type=int, default=5000)
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    args = parser.parse_args()
+
+    entries = random_songs(args.songs, seed=14)
+    print(f"{args.songs} lagu, backend={args.backend} (detik, termasuk flush)")
+    print(f"{'cara':<25} {'add':>8} {'update':>8} {'delete':>8}")
+    for label, (add, update, delete) in run(entries, args.backend).items():
+        print(f"{label:<25} {add:>8.3f} {update:>8.3f} {delete:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Latensi fuzzy search (trigram) pada katalog sintetis 200k lagu.
+
+Query diambil dari judul/artis lagu acak lalu diberi typo (huruf diganti,
+dibuang atau ditukar) dan pemisah berlebih seperti data asli.
+
+    python benchmarks/bench_fuzzy_search.py [--songs 200000] [--queries 500]
+"""
+import argparse
+import random
+import string
+import time
+
+from _data import random_songs, temp_data_manager
+
+
+def add_typo(rng, text):
+    """Satu typo acak di kata terpanjang, plus spasi/pemisah berlebih"""
+    words = text.split()
+    i = max(range(len(words)), key=lambda k: len(words[k]))
+    word = words[i]
+    pos = rng.randrange(len(word))
+    kind = rng.choice(("replace", "drop", "swap"))
+    if kind == "replace":
+        word = word[:pos] + rng.choice(string.ascii_lowercase) + word[pos + 1:]
+    elif kind == "drop" and len(word) > 3:
+        word = word[:pos] + word[pos + 1:]
+    elif pos + 1 < len(word):
+        word = word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:]
+    words[i] = word
+    return "  ".join(words) + rng.choice(("", " - ", "  "))
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--songs", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    entries = random_songs(args.songs, seed=9)
+    with temp_data_manager() as dm:
+        start = time.perf_counter()
+        dm.add_songs(entries)
+        build_time = time.perf_counter() - start
+        print(f"{args.songs} lagu di-index dalam {build_time:.2f} s "
+              f"({len(dm.search_index.vocab)} kata unik)")
+
+        songs = dm.get_all_songs()
+        for label, field in (("title", "title"), ("artist", "artist")):
+            timings = []
+            hits = 0
+            for _ in range(args.queries):
+                song = rng.choice(songs)
+                query = add_typo(rng, getattr(song, field))
+                start = time.perf_counter()
+                result = dm.fuzzy_search(query, args.limit)
+                timings.append(time.perf_counter() - start)
+                hits += any(getattr(node, field) == getattr(song, field) for node in result)
+            print(f"{label:>6}: median {percentile(timings, 0.5) * 1e3:6.2f} ms, "
+                  f"p95 {percentile(timings, 0.95) * 1e3:6.2f} ms, "
+                  f"max {max(timings) * 1e3:6.2f} ms, "
+                  f"target di top-{args.limit}: {hits / args.queries:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Latensi login untuk jumlah user yang bertambah.
+
+Login memakai index username, jadi waktu per login harus tetap datar
+walau jumlah akun naik 100x.
+
+    python benchmarks/bench_login.py [--backend json|sqlite]
+"""
+import argparse
+import random
+import time
+
+from _data import temp_data_manager
+
+USER_COUNTS = (1_000, 10_000, 100_000)
+LOGINS = 20_000
+
+
+def bench(user_count, backend):
+    rng = random.Random(user_count)
+    with temp_data_manager(backend) as dm:
+        start = time.perf_counter()
+        with dm.batch():
+            for i in range(user_count):
+                dm.register(f"user{i}", f"pw{i}")
+        register_time = time.perf_counter() - start
+
+        targets = [rng.randrange(user_count) for _ in range(LOGINS)]
+        start = time.perf_counter()
+        for i in targets:
+            assert dm.login(f"user{i}", f"pw{i}") is not None
+        login_time = time.perf_counter() - start
+
+        # Login gagal (username tidak ada) juga tidak boleh menelusuri semua user
+        start = time.perf_counter()
+        for i in targets:
+            dm.login(f"missing{i}", "pw")
+        missing_time = time.perf_counter() - start
+    return register_time, login_time / LOGINS, missing_time / LOGINS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    args = parser.parse_args()
+
+    print(f"backend={args.backend}, {LOGINS} login per ukuran")
+    print(f"{'users':>8} {'register (s)':>13} {'login (us)':>11} {'gagal (us)':>11}")
+    for user_count in USER_COUNTS:
+        register_time, login_time, missing_time = bench(user_count, args.backend)
+        print(f"{user_count:>8} {register_time:>13.2f} {login_time * 1e6:>11.2f} {missing_time * 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
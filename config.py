@@ -12,6 +12,17 @@ DATA_DIR = os.path.join(BASE_DIR, 'data')
 # Nama file data utama
 USERS_FILE = os.path.join(DATA_DIR, 'users.json')
 SONGS_FILE = os.path.join(DATA_DIR, 'songs.json')
+# Journal mutasi append-only; di-compact ke snapshot JSON setelah melewati batas ukuran
+JOURNAL_FILE = os.path.join(DATA_DIR, 'journal.log')
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+# Jeda (detik) sebelum mutasi yang tertunda ditulis ke disk; mutasi beruntun digabung jadi satu tulis
+FLUSH_DELAY = 0.5
+
+# Backend penyimpanan: "json" (snapshot + journal) atau "sqlite"
+STORAGE_BACKEND = "json"
+DATABASE_FILE = os.path.join(DATA_DIR, 'spotipai.db')
+# Folder riwayat putar (file biner per user)
+HISTORY_DIR = os.path.join(DATA_DIR, 'history')
 
 # Colors
 COLOR_PRIMARY = "#0d0d0d"       # Black
@@ -0,0 +1,90 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from config import BASE_DIR
+from audio_info import read_duration, read_tags
+
+# Ekstensi file yang dianggap lagu
+AUDIO_EXTENSIONS = (".mp3", ".wav")
+# Konvensi nama file: "Artist - Title (genre).mp3", genre opsional
+_FILENAME_RE = re.compile(r"^(?P<artist>.+?)\s+-\s+(?P<title>.+?)(?:\s*\((?P<genre>[^()]+)\))?$")
+# Jumlah thread maksimal; pekerjaan per file didominasi baca disk, bukan CPU
+MAX_WORKERS = 8
+
+
+def parse_filename(file_path):
+    """Ambil artist, title dan genre dari nama file; field yang tidak ada bernilai kosong"""
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    match = _FILENAME_RE.match(stem.strip())
+    if not match:
+        return {"title": "", "artist": "", "genre": ""}
+    genre = (match.group("genre") or "").strip()
+    return {
+        "title": match.group("title").strip(),
+        "artist": match.group("artist").strip(),
+        # Genre di katalog ditulis kapital di awal ("pop" -> "Pop", "R&B" tetap)
+        "genre": genre[:1].upper() + genre[1:],
+    }
+
+
+def catalog_path(file_path):
+    """Path yang disimpan di katalog: relatif ke folder aplikasi bila berada di dalamnya"""
+    absolute = os.path.abspath(file_path)
+    try:
+        relative = os.path.relpath(absolute, BASE_DIR)
+    except ValueError:
+        return absolute  # Drive berbeda (Windows)
+    if relative.startswith(os.pardir):
+        return absolute
+    return relative.replace(os.sep, "/")
+
+
+def _path_key(file_path):
+    """Kunci pembanding path (path relatif dianggap relatif ke folder aplikasi)"""
+    return os.path.normcase(os.path.abspath(os.path.join(BASE_DIR, file_path)))
+
+
+def read_song_info(file_path):
+    """Metadata satu file: nama file diutamakan, tag ID3 mengisi field yang kosong"""
+    info = parse_filename(file_path)
+    if not all(info.values()):
+        tags = read_tags(file_path)
+        for key, value in info.items():
+            if not value:
+                info[key] = tags.get(key, "")
+    if not info["title"]:
+        info["title"] = os.path.splitext(os.path.basename(file_path))[0]
+    info["file_path"] = catalog_path(file_path)
+    info["duration"] = read_duration(file_path)
+    return info
+
+
+def find_audio_files(folder):
+    """Semua file audio di dalam folder (rekursif), urut berdasarkan path"""
+    files = []
+    for root, _, names in os.walk(folder):
+        for name in names:
+            if name.lower().endswith(AUDIO_EXTENSIONS):
+                files.append(os.path.join(root, name))
+    files.sort()
+    return files
+
+
+def scan_folder(folder, known_paths=(), max_workers=MAX_WORKERS):
+    """Pindai folder dan kembalikan daftar data lagu baru (siap untuk `DataManager.add_songs`).
+
+    File yang path-nya sudah ada di `known_paths` dilewati. Metadata dan durasi
+    dibaca paralel di thread pool; urutan hasil mengikuti urutan path.
+    """
+    known = {_path_key(path) for path in known_paths if path}
+    files = []
+    for path in find_audio_files(folder):
+        key = _path_key(path)
+        if key not in known:
+            known.add(key)
+            files.append(path)
+
+    if not files:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(read_song_info, files))
@@ -117,6 +117,9 @@ def main():
     # Create main window
     window = MainApplication()
     window.show()
+
+    # Flush data yang masih tertunda sebelum aplikasi keluar
+    app.aboutToQuit.connect(window.data_manager.close)
     
     sys.exit(app.exec())
 
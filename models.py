@@ -1,15 +1,35 @@
-import json
-import os
-from config import USERS_FILE, SONGS_FILE, DATA_DIR, ADMIN_USERNAME, ADMIN_PASSWORD
+import atexit
+import contextlib
+import gc
+import heapq
+import sys
+import threading
+import tracemalloc
+from config import ADMIN_USERNAME, ADMIN_PASSWORD, HISTORY_DIR
+from storage import JsonStorage, create_storage
+from search import FieldIndex, SearchIndex
+from recommender import CoOccurrenceRecommender
+from play_history import PlayHistory
+from audio_info import read_duration
+
+
+def _intern(value):
+    """Intern string agar nilai yang sama di banyak node berbagi satu objek"""
+    return sys.intern(value) if type(value) is str else value
+
 
 class SongNode:
     """Node untuk song dalam linked list"""
-    def __init__(self, song_id, title, artist, genre, file_path=""):
-        self.song_id = song_id
+    # __slots__ menghilangkan __dict__ per node; artist/genre di-intern karena sangat sering berulang
+    __slots__ = ("song_id", "title", "artist", "genre", "file_path", "duration", "next")
+
+    def __init__(self, song_id, title, artist, genre, file_path="", duration=0):
+        self.song_id = _intern(song_id)
         self.title = title
-        self.artist = artist
-        self.genre = genre
+        self.artist = _intern(artist)
+        self.genre = _intern(genre)
         self.file_path = file_path
+        self.duration = duration  # Durasi (detik) dari header file audio; 0 = belum diketahui
         self.next = None
 
     def to_dict(self):
@@ -18,21 +38,24 @@ class SongNode:
             "title": self.title,
             "artist": self.artist,
             "genre": self.genre,
-            "file_path": self.file_path
+            "file_path": self.file_path,
+            "duration": self.duration
         }
 
     @staticmethod
     def from_dict(data):
         return SongNode(
             data["song_id"], data["title"], data["artist"],
-            data["genre"], data.get("file_path", "")
+            data["genre"], data.get("file_path", ""), data.get("duration", 0)
         )
 
 
 class PlaylistNode:
     """Node untuk doubly linked list playlist"""
+    __slots__ = ("song_id", "prev", "next")
+
     def __init__(self, song_id):
-        self.song_id = song_id
+        self.song_id = _intern(song_id)
         self.prev = None
         self.next = None
 
@@ -46,10 +69,13 @@ class PlaylistNode:
 
 class DoublyLinkedList:
     """Doubly linked list untuk playlist"""
+    __slots__ = ("head", "tail", "size", "nodes")
+
     def __init__(self):
         self.head = None
         self.tail = None
         self.size = 0
+        self.nodes = {}  # Index song_id -> PlaylistNode untuk operasi O(1)
 
     def is_empty(self):
         return self.head is None
@@ -57,6 +83,7 @@ class DoublyLinkedList:
     def append(self, song_id):
         """Tambah song ke akhir playlist"""
         new_node = PlaylistNode(song_id)
+        self.nodes[song_id] = new_node
         if self.is_empty():
             self.head = new_node
             self.tail = new_node
@@ -68,32 +95,26 @@ class DoublyLinkedList:
 
     def remove(self, song_id):
         """Hapus song dari playlist"""
-        current = self.head
-        while current:
-            if current.song_id == song_id:
-                if current.prev:
-                    current.prev.next = current.next
-                else:
-                    self.head = current.next
-                
-                if current.next:
-                    current.next.prev = current.prev
-                else:
-                    self.tail = current.prev
-                
-                self.size -= 1
-                return True
-            current = current.next
-        return False
+        current = self.nodes.pop(song_id, None)
+        if current is None:
+            return False
+
+        if current.prev:
+            current.prev.next = current.next
+        else:
+            self.head = current.next
+
+        if current.next:
+            current.next.prev = current.prev
+        else:
+            self.tail = current.prev
+
+        self.size -= 1
+        return True
 
     def contains(self, song_id):
         """Cek apakah song ada di playlist"""
-        current = self.head
-        while current:
-            if current.song_id == song_id:
-                return True
-            current = current.next
-        return False
+        return song_id in self.nodes
 
     def to_list(self):
         """Konversi ke daftar dict untuk penyimpanan ke JSON"""
@@ -109,6 +130,7 @@ class DoublyLinkedList:
         self.head = None
         self.tail = None
         self.size = 0
+        self.nodes = {}
         for item in data_list:
             if isinstance(item, str):
                 song_id = item
@@ -117,7 +139,8 @@ class DoublyLinkedList:
             else:
                 continue
 
-            if song_id:
+            # Playlist tidak menyimpan song_id ganda (sama seperti add_to_playlist)
+            if song_id and song_id not in self.nodes:
                 self.append(song_id)
 
     def get_all_song_ids(self):
@@ -131,20 +154,16 @@ class DoublyLinkedList:
 
     def get_next(self, song_id):
         """Dapatkan `song_id` berikutnya setelah `song_id` yang diberikan"""
-        current = self.head
-        while current:
-            if current.song_id == song_id:
-                return current.next.song_id if current.next else None
-            current = current.next
+        current = self.nodes.get(song_id)
+        if current and current.next:
+            return current.next.song_id
         return None
 
     def get_prev(self, song_id):
         """Dapatkan `song_id` sebelumnya sebelum `song_id` yang diberikan"""
-        current = self.head
-        while current:
-            if current.song_id == song_id:
-                return current.prev.song_id if current.prev else None
-            current = current.next
+        current = self.nodes.get(song_id)
+        if current and current.prev:
+            return current.prev.song_id
         return None
 
     def get_first(self):
@@ -158,6 +177,8 @@ class DoublyLinkedList:
 
 class UserNode:
     """Node untuk user dalam linked list"""
+    __slots__ = ("username", "password", "is_admin", "playlist", "profile_image", "next")
+
     def __init__(self, username, password, is_admin=False):
         self.username = username
         self.password = password
@@ -191,131 +212,447 @@ class DataManager:
     """Manager untuk mengelola data JSON"""
 
     def __init__(self):
-        self._ensure_data_files_exist()
         self.library_head = None
         self.users_head = None
+        self.song_index = {}  # Index song_id -> SongNode untuk lookup O(1)
+        self.user_index = {}  # Index username -> UserNode untuk lookup O(1)
+        self.search_index = SearchIndex()  # Inverted index untuk pencarian library
+        self.artist_index = FieldIndex("artist")  # Index artist ternormalisasi -> lagu
+        self.genre_index = FieldIndex("genre")  # Index genre ternormalisasi -> lagu
         self.letter_counters = {}  # Counter per huruf pertama genre untuk song_id unik
+        self.listeners = []  # Callback(event, song) yang dipanggil saat katalog berubah
+        self.recommender = None  # Co-occurrence playlist; dibangun di background setelah load
+        self._recommender_pending = None  # Perubahan playlist selama recommender dibangun
+        self._recommender_lock = threading.Lock()
+        # Counter analytics, diperbarui setiap mutasi/putar agar panel admin tidak menelusuri data
+        self.play_counts = {}  # song_id -> total putar semua user
+        self.playlist_counts = {}  # song_id -> jumlah playlist user yang memuatnya
+        self._batch_ops = None  # Mutasi yang ditahan selama blok `batch()`
+        self._batch_depth = 0
+        self.storage = create_storage(self._snapshot)
+        self.history = PlayHistory(HISTORY_DIR)  # Riwayat putar per user, ditulis di background
+        if self.storage.needs_migration():
+            self._migrate_from_json()
         self._load_all_data()
-
-    def _ensure_data_files_exist(self):
-        """Buat file JSON jika belum ada"""
-        if not os.path.exists(DATA_DIR):
-            os.makedirs(DATA_DIR)
-
-        if not os.path.exists(USERS_FILE):
-            self._save_json(USERS_FILE, [])
-
-        if not os.path.exists(SONGS_FILE):
-            self._save_json(SONGS_FILE, [])
+        self._start_recommender_build()
+        # Pastikan mutasi yang masih tertunda tetap tertulis saat aplikasi keluar
+        atexit.register(self.close)
 
     def _load_all_data(self):
-        """Load semua data dari JSON ke memory"""
+        """Load snapshot JSON ke memory lalu replay journal mutasi di atasnya"""
         self._load_songs()
         self._load_users()
+        with self.search_index.bulk():
+            for op, data in self.storage.read_journal():
+                self._replay(op, data)
+        self.storage.finish_replay()
+        self.play_counts = self.history.load_play_counts()
+        self.playlist_counts = self._count_playlist_entries()
+
+    def _count_playlist_entries(self):
+        """Hitung jumlah playlist per lagu sekali saat load; selanjutnya diperbarui per mutasi"""
+        if self.storage.lazy_users:
+            return self.storage.load_playlist_counts()
+        counts = {}
+        ptr = self.users_head
+        while ptr:
+            for song_id in ptr.playlist.get_all_song_ids():
+                counts[song_id] = counts.get(song_id, 0) + 1
+            ptr = ptr.next
+        return counts
+
+    def _migrate_from_json(self):
+        """Salin data JSON lama (snapshot + journal) ke backend baru satu kali"""
+        target = self.storage
+        self.storage = JsonStorage(self._snapshot)
+        self._load_all_data()
+        self.storage.close()
+        target.import_snapshot(*self._snapshot())
+        self.storage = target
 
     def _load_songs(self):
         """Load lagu dari JSON"""
-        data = self._load_json(SONGS_FILE)
+        data = self.storage.load_songs()
         self.library_head = None
+        self.song_index = {}
+        self.search_index = SearchIndex()
+        self.artist_index = FieldIndex("artist")
+        self.genre_index = FieldIndex("genre")
         self.letter_counters = {}
 
-        for song_data in data:
-            node = SongNode.from_dict(song_data)
-            node.next = self.library_head
-            self.library_head = node
-
-            # Update letter counters untuk song_id unik
-            genre = song_data.get("genre", "")
-            if genre and node.song_id:
-                first_letter = genre[0].upper()
-                count = int(node.song_id[1:]) if len(node.song_id) > 1 and node.song_id[1:].isdigit() else 0
-                if first_letter not in self.letter_counters:
-                    self.letter_counters[first_letter] = 0
-                self.letter_counters[first_letter] = max(self.letter_counters[first_letter], count)
+        # Postings dibangun dulu, daftar token diurutkan sekali di akhir
+        with self.search_index.bulk():
+            for song_data in data:
+                self._insert_song(SongNode.from_dict(song_data))
 
     def _load_users(self):
         """Load user dari JSON"""
-        data = self._load_json(USERS_FILE)
+        data = self.storage.load_users()
         self.users_head = None
+        self.user_index = {}
 
         for user_data in data:
-            user = UserNode.from_dict(user_data)
-            user.next = self.users_head
-            self.users_head = user
+            self._insert_user(UserNode.from_dict(user_data))
+
+    def _replay(self, op, data):
+        """Terapkan satu entri journal ke state di memory (tanpa mencatat ulang)"""
+        if op == "add_song":
+            if data["song_id"] not in self.song_index:
+                self._insert_song(SongNode.from_dict(data))
+        elif op == "update_song":
+            node = self.song_index.get(data["song_id"])
+            if node:
+                self._apply_song_fields(node, data)
+        elif op == "delete_song":
+            self._unlink_song(data["song_id"])
+        elif op == "register":
+            if data["username"] not in self.user_index:
+                self._insert_user(UserNode.from_dict(data))
+        else:
+            user = self.user_index.get(data.get("username") or data.get("old_username"))
+            if not user:
+                return
+            if op == "playlist_add":
+                if not user.playlist.contains(data["song_id"]):
+                    user.playlist.append(data["song_id"])
+            elif op == "playlist_remove":
+                user.playlist.remove(data["song_id"])
+            elif op == "playlist_clear":
+                user.playlist = DoublyLinkedList()
+            elif op == "update_profile_image":
+                user.profile_image = data["profile_image"]
+            elif op == "update_password":
+                user.password = data["password"]
+            elif op == "update_username":
+                if data["new_username"] not in self.user_index:
+                    self._rename_user(user, data["new_username"])
+
+    def _snapshot(self):
+        """Serialisasi seluruh lagu dan user untuk ditulis ke snapshot JSON"""
+        songs_data = []
+        ptr = self.library_head
+        while ptr:
+            songs_data.append(ptr.to_dict())
+            ptr = ptr.next
+
+        users_data = []
+        ptr = self.users_head
+        while ptr:
+            users_data.append(ptr.to_dict())
+            ptr = ptr.next
+
+        # Loader menyisipkan di depan list, jadi simpan dari tail agar urutan tetap sama setelah load
+        songs_data.reverse()
+        users_data.reverse()
+        return songs_data, users_data
 
-    def _load_json(self, file_path):
-        """Baca file JSON. Kembalikan list kosong jika file tidak ada atau JSON tidak valid."""
+    def flush(self):
+        """Tulis segera semua mutasi yang masih tertunda ke disk"""
+        self.storage.flush()
+
+    def close(self):
+        """Flush mutasi tertunda dan tutup storage serta riwayat putar"""
+        self.storage.close()
+        self.history.close()
+
+    def _record(self, op, data):
+        """Catat satu mutasi ke storage, atau tahan bila sedang di dalam `batch()`"""
+        if self._batch_ops is not None:
+            self._batch_ops.append((op, data))
+        else:
+            self.storage.record(op, data)
+
+    def _record_many(self, entries):
+        """Catat banyak mutasi (op, data) sekaligus"""
+        if self._batch_ops is not None:
+            self._batch_ops.extend(entries)
+        else:
+            self.storage.record_many(entries)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Kelompokkan banyak mutasi agar ditulis ke storage sekali di akhir blok.
+
+        Contoh::
+
+            with data_manager.batch():
+                for song_id in ids:
+                    data_manager.update_song(song_id, genre="Pop")
+
+        Perubahan di memory tetap langsung terlihat; hanya penulisan yang ditunda.
+        Blok bisa bersarang, penulisan terjadi saat blok terluar selesai.
+        """
+        if self._batch_depth == 0:
+            self._batch_ops = []
+        self._batch_depth += 1
         try:
-            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return []
-        except json.JSONDecodeError:
-            # Bila file corrupt atau berformat salah, kembalikan default
-            return []
-
-    def _save_json(self, file_path, data):
-        """Save JSON file"""
-        # Pastikan direktori tujuan ada sebelum menulis
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        # Gunakan 'utf-8-sig' saat menyimpan agar file dapat dibukadengan benar pada berbagai editor di Windows.
-        with open(file_path, 'w', encoding='utf-8-sig') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                ops, self._batch_ops = self._batch_ops, None
+                if ops:
+                    self.storage.record_many(ops)
+
+    def add_listener(self, callback):
+        """Daftarkan callback(event, song) untuk perubahan katalog.
+
+        Event: "song_added", "song_updated", "song_deleted", atau versi massalnya
+        "songs_added", "songs_updated", "songs_deleted" (dari `add_songs`,
+        `update_songs`, `delete_songs`) dengan argumen kedua berupa daftar node.
+        """
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """Hapus callback yang didaftarkan lewat `add_listener`"""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def _notify(self, event, song):
+        """Beri tahu semua listener tentang perubahan satu lagu"""
+        for callback in list(self.listeners):
+            callback(event, song)
+
+    def memory_report(self):
+        """Ukur memory katalog lagu dengan tracemalloc dengan memuat ulang katalog dari storage"""
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        gc.collect()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+        data = self.storage.load_songs()
+        nodes = [SongNode.from_dict(song_data) for song_data in data]
+        del data  # Hanya string yang dipakai node yang tetap hidup
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+
+        if not was_tracing:
+            tracemalloc.stop()
+        used = current - baseline
+        return {
+            "songs": len(nodes),
+            "bytes": used,
+            "bytes_per_song": used / len(nodes) if nodes else 0,
+            "peak_bytes": peak - baseline,
+        }
 
     # SONG MANAGEMENT 
-    def add_song(self, title, artist, genre, file_path=""):
-        """Tambah lagu"""
-        first_letter = genre[0].upper() if genre else "S"
-        if first_letter not in self.letter_counters:
-            self.letter_counters[first_letter] = 0
-        count = self.letter_counters[first_letter] + 1
-        self.letter_counters[first_letter] = count
-        song_id = f"{first_letter}{count}"
-
-        node = SongNode(song_id, title, artist, genre, file_path)
+    def _insert_song(self, node):
+        """Sisipkan node di depan library dan perbarui index serta letter counters"""
         node.next = self.library_head
         self.library_head = node
+        self.song_index[node.song_id] = node
+        self._index_song(node)
+
+        # Update letter counters untuk song_id unik. Huruf diambil dari song_id, bukan genre:
+        # lagu tanpa genre ber-id "S<n>" dan genre bisa diedit setelah id dialokasikan
+        if node.song_id:
+            first_letter = node.song_id[0].upper()
+            count = int(node.song_id[1:]) if len(node.song_id) > 1 and node.song_id[1:].isdigit() else 0
+            if first_letter not in self.letter_counters:
+                self.letter_counters[first_letter] = 0
+            self.letter_counters[first_letter] = max(self.letter_counters[first_letter], count)
+
+    def _index_song(self, node):
+        """Masukkan lagu ke index pencarian, artist dan genre"""
+        self.search_index.add(node)
+        self.artist_index.add(node)
+        self.genre_index.add(node)
+
+    def _unindex_song(self, node):
+        """Keluarkan lagu dari index pencarian, artist dan genre"""
+        self.search_index.remove(node)
+        self.artist_index.remove(node)
+        self.genre_index.remove(node)
+
+    def _unlink_song(self, song_id):
+        """Lepas node lagu dari linked list dan index; kembalikan node yang dilepas atau None"""
+        # Index menolak song_id yang tidak ada tanpa perlu menelusuri list
+        target = self.song_index.get(song_id)
+        if target is None:
+            return None
 
-        self._save_songs()
-        return song_id
-
-    def delete_song(self, song_id):
-        """Hapus lagu dari library berdasarkan `song_id`"""
         prev = None
         ptr = self.library_head
 
         while ptr:
-            if ptr.song_id == song_id:
+            if ptr is target:
                 if prev:
                     prev.next = ptr.next
                 else:
                     self.library_head = ptr.next
-                self._save_songs()
-                return True
+                # Data lama bisa berisi song_id ganda; arahkan index ke duplikat berikutnya
+                dup = ptr.next
+                while dup and dup.song_id != song_id:
+                    dup = dup.next
+                if dup:
+                    self.song_index[song_id] = dup
+                else:
+                    del self.song_index[song_id]
+                self._unindex_song(ptr)
+                return ptr
             prev = ptr
             ptr = ptr.next
 
+        return None
+
+    def _apply_song_fields(self, node, fields):
+        """Salin field lagu yang terisi dari `fields` ke node"""
+        for key in ("title", "artist", "genre", "file_path", "duration"):
+            if fields.get(key):
+                value = fields[key]
+                setattr(node, key, _intern(value) if key in ("artist", "genre") else value)
+        self._unindex_song(node)
+        self._index_song(node)
+
+    def _next_song_id(self, genre):
+        """Alokasikan song_id unik berikutnya berdasarkan huruf pertama genre"""
+        first_letter = genre[0].upper() if genre else "S"
+        if first_letter not in self.letter_counters:
+            self.letter_counters[first_letter] = 0
+        count = self.letter_counters[first_letter] + 1
+        self.letter_counters[first_letter] = count
+        return f"{first_letter}{count}"
+
+    def add_song(self, title, artist, genre, file_path="", duration=None):
+        """Tambah lagu; durasi dibaca dari header file bila tidak diberikan"""
+        song_id = self._next_song_id(genre)
+        if duration is None:
+            duration = read_duration(file_path)
+        node = SongNode(song_id, title, artist, genre, file_path, duration)
+        self._insert_song(node)
+
+        self._record("add_song", node.to_dict())
+        self._notify("song_added", node)
+        return song_id
+
+    def add_songs(self, entries):
+        """Tambah banyak lagu sekaligus (mis. hasil scan folder) dengan satu kali simpan.
+
+        `entries` berisi dict dengan kunci title, artist, genre, dan opsional
+        file_path serta duration. Listener menerima satu event "songs_added"
+        berisi daftar node baru. Kembalikan daftar song_id baru.
+        """
+        nodes = []
+        with self.search_index.bulk():
+            for entry in entries:
+                file_path = entry.get("file_path", "")
+                duration = entry.get("duration")
+                if duration is None:
+                    duration = read_duration(file_path)
+                node = SongNode(self._next_song_id(entry["genre"]), entry["title"], entry["artist"],
+                                entry["genre"], file_path, duration)
+                self._insert_song(node)
+                nodes.append(node)
+
+        if nodes:
+            self._record_many([("add_song", node.to_dict()) for node in nodes])
+            self._notify("songs_added", nodes)
+        return [node.song_id for node in nodes]
+
+    def delete_song(self, song_id):
+        """Hapus lagu dari library berdasarkan `song_id`"""
+        node = self._unlink_song(song_id)
+        if node:
+            self._record("delete_song", {"song_id": song_id})
+            self._notify("song_deleted", node)
+            return True
         return False
 
     def update_song(self, song_id, title=None, artist=None, genre=None, file_path=None):
         """Perbarui informasi lagu berdasarkan `song_id`"""
-        ptr = self.library_head
+        ptr = self.song_index.get(song_id)
+        if ptr is None:
+            return False
+
+        fields = {"title": title, "artist": artist, "genre": genre, "file_path": file_path}
+        self._record("update_song", self._update_song_node(ptr, fields))
+        self._notify("song_updated", ptr)
+        return True
 
+    def _update_song_node(self, ptr, fields):
+        """Terapkan field yang terisi ke node; kembalikan data untuk dicatat ke storage"""
+        fields = {key: fields.get(key) for key in ("title", "artist", "genre", "file_path") if fields.get(key)}
+        file_path = fields.get("file_path")
+        if file_path and file_path != ptr.file_path:
+            # File berubah: durasi lama tidak berlaku lagi
+            fields["duration"] = read_duration(file_path)
+        self._apply_song_fields(ptr, fields)
+        return {"song_id": ptr.song_id, **fields}
+
+    def update_songs(self, updates):
+        """Perbarui banyak lagu dengan satu kali simpan.
+
+        `updates` berisi dict dengan kunci song_id dan field yang ingin diubah
+        (title, artist, genre, file_path). Kembalikan jumlah lagu yang diperbarui.
+        """
+        nodes = []
+        records = []
+        for fields in updates:
+            ptr = self.song_index.get(fields.get("song_id"))
+            if ptr is not None:
+                records.append(("update_song", self._update_song_node(ptr, fields)))
+                nodes.append(ptr)
+
+        if nodes:
+            self._record_many(records)
+            self._notify("songs_updated", nodes)
+        return len(nodes)
+
+    def delete_songs(self, song_ids):
+        """Hapus banyak lagu dengan satu kali telusur linked list dan satu kali simpan.
+
+        Kembalikan jumlah lagu yang dihapus.
+        """
+        targets = {}
+        for song_id in dict.fromkeys(song_ids):
+            node = self.song_index.get(song_id)
+            if node is not None:
+                targets[node] = song_id
+        if not targets:
+            return 0
+
+        deleted_ids = set(targets.values())
+        replacements = {}  # song_id -> duplikat yang tersisa (data lama bisa berisi song_id ganda)
+        removed = []
+        prev = None
+        ptr = self.library_head
         while ptr:
-            if ptr.song_id == song_id:
-                if title:
-                    ptr.title = title
-                if artist:
-                    ptr.artist = artist
-                if genre:
-                    ptr.genre = genre
-                if file_path:
-                    ptr.file_path = file_path
-                self._save_songs()
-                return True
-            ptr = ptr.next
+            next_ptr = ptr.next
+            if ptr in targets:
+                if prev:
+                    prev.next = next_ptr
+                else:
+                    self.library_head = next_ptr
+                removed.append(ptr)
+            else:
+                if ptr.song_id in deleted_ids and ptr.song_id not in replacements:
+                    replacements[ptr.song_id] = ptr
+                prev = ptr
+            ptr = next_ptr
+
+        with self.search_index.bulk():
+            for node in removed:
+                if node.song_id in replacements:
+                    self.song_index[node.song_id] = replacements[node.song_id]
+                else:
+                    self.song_index.pop(node.song_id, None)
+                self._unindex_song(node)
 
-        return False
+        self._record_many([("delete_song", {"song_id": node.song_id}) for node in removed])
+        self._notify("songs_deleted", removed)
+        return len(removed)
+
+    def set_song_duration(self, song_id, duration):
+        """Simpan durasi lagu (detik) yang diperoleh dari luar, mis. hasil decode mixer"""
+        ptr = self.song_index.get(song_id)
+        if ptr is None or not duration:
+            return False
+        ptr.duration = duration
+        self._record("update_song", {"song_id": song_id, "duration": duration})
+        return True
 
     def get_all_songs(self):
         """Dapatkan semua lagu sebagai daftar objek `SongNode`"""
@@ -328,12 +665,23 @@ class DataManager:
 
     def get_song_by_id(self, song_id):
         """Dapatkan lagu berdasarkan `song_id`"""
-        ptr = self.library_head
-        while ptr:
-            if ptr.song_id == song_id:
-                return ptr
-            ptr = ptr.next
-        return None
+        return self.song_index.get(song_id)
+
+    def search_songs(self, query, limit=None):
+        """Cari lagu berdasarkan title/artist/genre (prefix), urut dari yang paling relevan"""
+        return self.search_index.search(query, limit)
+
+    def fuzzy_search(self, query, limit=10):
+        """Cari lagu yang mirip query walau ada typo atau pemisah berlebih (berbasis trigram)"""
+        return self.search_index.fuzzy_search(query, limit)
+
+    def get_songs_by_artist(self, artist):
+        """Dapatkan lagu dari satu artis; nama dinormalisasi ("Sabrina Carpenter - " = "sabrina carpenter")"""
+        return self.artist_index.get(artist)
+
+    def get_songs_by_genre(self, genre):
+        """Dapatkan lagu dari satu genre; nama dinormalisasi seperti `get_songs_by_artist`"""
+        return self.genre_index.get(genre)
 
     def get_song_by_index(self, index):
         """Dapatkan lagu berdasarkan indeks (0-based)"""
@@ -346,65 +694,57 @@ class DataManager:
             i += 1
         return None
 
-    def _save_songs(self):
-        """Simpan daftar lagu ke file JSON"""
-        songs_data = []
-        ptr = self.library_head
-        while ptr:
-            songs_data.append(ptr.to_dict())
-            ptr = ptr.next
-        self._save_json(SONGS_FILE, songs_data)
-
     # USER MANAGEMENT 
+    def _insert_user(self, user):
+        """Sisipkan user di depan linked list dan index"""
+        user.next = self.users_head
+        self.users_head = user
+        self.user_index[user.username] = user
+
+    def _rename_user(self, user, new_username):
+        """Ganti username dan perbarui index"""
+        del self.user_index[user.username]
+        user.username = new_username
+        self.user_index[new_username] = user
+
     def register(self, username, password, is_admin=False):
         """Daftarkan user baru ke dalam sistem"""
-        ptr = self.users_head
-        while ptr:
-            if ptr.username == username:
-                return False
-            ptr = ptr.next
+        if self.get_user_by_username(username):
+            return False
 
         user = UserNode(username, password, is_admin)
-        user.next = self.users_head
-        self.users_head = user
+        self._insert_user(user)
 
-        self._save_users()
+        self._record("register", user.to_dict())
         return True
 
     def login(self, username, password):
         """Autentikasi user berdasarkan username dan password"""
-        ptr = self.users_head
-        while ptr:
-            if ptr.username == username and ptr.password == password:
-                return ptr
-            ptr = ptr.next
+        user = self.get_user_by_username(username)
+        if user and user.password == password:
+            return user
         return None
 
     def get_user_by_username(self, username):
         """Dapatkan objek user berdasarkan `username`"""
-        ptr = self.users_head
-        while ptr:
-            if ptr.username == username:
-                return ptr
-            ptr = ptr.next
-        return None
-
-    def _save_users(self):
-        """Simpan data user ke file JSON"""
-        users_data = []
-        ptr = self.users_head
-        while ptr:
-            users_data.append(ptr.to_dict())
-            ptr = ptr.next
-        self._save_json(USERS_FILE, users_data)
+        user = self.user_index.get(username)
+        if user is None and self.storage.lazy_users:
+            # Backend lazy (SQLite): muat user dari storage saat pertama kali diakses
+            data = self.storage.load_user(username)
+            if data:
+                user = UserNode.from_dict(data)
+                self._insert_user(user)
+        return user
 
     # PLAYLIST MANAGEMENT 
     def add_to_playlist(self, username, song_id):
         """Tambah lagu ke playlist user"""
         user = self.get_user_by_username(username)
         if user and not user.playlist.contains(song_id):
+            self._update_recommender("add_item", user.playlist.get_all_song_ids(), song_id)
             user.playlist.append(song_id)
-            self._save_users()
+            self.playlist_counts[song_id] = self.playlist_counts.get(song_id, 0) + 1
+            self._record("playlist_add", {"username": username, "song_id": song_id})
             return True
         return False
 
@@ -412,7 +752,9 @@ class DataManager:
         """Hapus lagu dari playlist user"""
         user = self.get_user_by_username(username)
         if user and user.playlist.remove(song_id):
-            self._save_users()
+            self._update_recommender("remove_item", user.playlist.get_all_song_ids(), song_id)
+            self._decrement_playlist_count(song_id)
+            self._record("playlist_remove", {"username": username, "song_id": song_id})
             return True
         return False
 
@@ -428,6 +770,69 @@ class DataManager:
             return songs
         return []
 
+    def _decrement_playlist_count(self, song_id):
+        count = self.playlist_counts.get(song_id, 0) - 1
+        if count > 0:
+            self.playlist_counts[song_id] = count
+        else:
+            self.playlist_counts.pop(song_id, None)
+
+    def get_all_playlists(self):
+        """Playlist semua user sebagai daftar song_id, termasuk user yang belum dimuat (backend lazy)"""
+        if self.storage.lazy_users:
+            return self.storage.load_playlists()
+        playlists = []
+        ptr = self.users_head
+        while ptr:
+            playlists.append(ptr.playlist.get_all_song_ids())
+            ptr = ptr.next
+        return playlists
+
+    def _start_recommender_build(self):
+        """Bangun recommender di background thread agar startup dan GUI tidak menunggu"""
+        # Snapshot playlist diambil di thread ini (koneksi SQLite terikat ke thread pembuatnya);
+        # perubahan setelah snapshot ditahan di _recommender_pending lalu diterapkan berurutan
+        playlists = self.get_all_playlists()
+        with self._recommender_lock:
+            self.recommender = None
+            self._recommender_pending = []
+        threading.Thread(target=self._build_recommender, args=(playlists,), daemon=True).start()
+
+    def _build_recommender(self, playlists):
+        recommender = CoOccurrenceRecommender()
+        recommender.load_playlists(playlists)
+        with self._recommender_lock:
+            for method, args in self._recommender_pending:
+                getattr(recommender, method)(*args)
+            self._recommender_pending = None
+            self.recommender = recommender
+
+    def _update_recommender(self, method, *args):
+        """Terapkan perubahan playlist ke recommender, atau tahan bila masih dibangun"""
+        with self._recommender_lock:
+            if self.recommender is not None:
+                getattr(self.recommender, method)(*args)
+            elif self._recommender_pending is not None:
+                self._recommender_pending.append((method, args))
+
+    def recommend_song(self, song_id, skip=None):
+        """Lagu yang paling sering satu playlist dengan `song_id` dan tidak di-`skip(song)`.
+
+        None bila tidak ada, atau bila recommender masih dibangun (pemanggil
+        memakai pilihan artis sama/acak).
+        """
+        recommender = self.recommender
+        if recommender is None:
+            return None
+
+        def skip_id(other_id):
+            node = self.song_index.get(other_id)
+            # Playlist bisa masih berisi song_id lagu yang sudah dihapus
+            return node is None or (skip is not None and skip(node))
+
+        other_id = recommender.recommend(song_id, skip_id)
+        return self.song_index.get(other_id) if other_id else None
+
     def get_next_song_in_playlist(self, username, current_song_id):
         """Dapatkan lagu berikutnya dalam playlist user setelah `current_song_id`"""
         user = self.get_user_by_username(username)
@@ -450,17 +855,56 @@ class DataManager:
         """Bersihkan playlist user (hapus semua lagu)"""
         user = self.get_user_by_username(username)
         if user:
+            self._update_recommender("remove_playlist", user.playlist.get_all_song_ids())
+            for song_id in user.playlist.get_all_song_ids():
+                self._decrement_playlist_count(song_id)
             user.playlist = DoublyLinkedList()
-            self._save_users()
+            self._record("playlist_clear", {"username": username})
             return True
         return False
 
+    # PLAY HISTORY
+    def record_play(self, username, song_id, seconds, started_at=None):
+        """Catat lagu yang diputar user beserta lama didengar (tidak menunggu disk)"""
+        self.play_counts[song_id] = self.play_counts.get(song_id, 0) + 1
+        self.history.record(username, song_id, seconds, started_at)
+
+    def get_top_songs(self, username, days=30, limit=10):
+        """Lagu yang paling sering diputar user dalam `days` hari terakhir: [(SongNode, jumlah putar)]"""
+        result = []
+        for song_id, plays in self.history.top_songs(username, days, limit):
+            song = self.get_song_by_id(song_id)
+            if song:  # Lagu yang sudah dihapus dilewati
+                result.append((song, plays))
+        return result
+
+    # ANALYTICS
+    def _top_songs_by(self, counts, limit):
+        """[(SongNode, jumlah)] dengan jumlah terbesar; lagu yang sudah dihapus dilewati"""
+        n = limit
+        while True:
+            top = heapq.nlargest(n, counts, key=counts.get)
+            result = [(self.song_index[song_id], counts[song_id]) for song_id in top if song_id in self.song_index]
+            if len(result) >= limit or len(top) < n:
+                return result[:limit]
+            n *= 2  # Sebagian hasil sudah dihapus dari katalog; ambil kandidat lebih banyak
+
+    def get_analytics(self, limit=10):
+        """Ringkasan untuk panel admin, dibaca dari counter yang selalu up to date"""
+        genres = self.genre_index.counts()
+        return {
+            "catalog_size": len(self.genre_index),
+            "genres": sorted(genres.items(), key=lambda item: (-item[1], item[0].lower())),
+            "most_played": self._top_songs_by(self.play_counts, limit),
+            "most_playlisted": self._top_songs_by(self.playlist_counts, limit),
+        }
+
     def update_user_profile_image(self, username, image_path):
         """Perbarui path foto profil user"""
         user = self.get_user_by_username(username)
         if user:
             user.profile_image = image_path
-            self._save_users()
+            self._record("update_profile_image", {"username": username, "profile_image": image_path})
             return True
         return False
 
@@ -496,8 +940,9 @@ class DataManager:
         
         user = self.get_user_by_username(old_username)
         if user:
-            user.username = new_username
-            self._save_users()
+            self._rename_user(user, new_username)
+            self._record("update_username", {"old_username": old_username, "new_username": new_username})
+            self.history.rename_user(old_username, new_username)
             return True
         return False
 
@@ -506,6 +951,6 @@ class DataManager:
         user = self.get_user_by_username(username)
         if user:
             user.password = new_password
-            self._save_users()
+            self._record("update_password", {"username": username, "password": new_password})
             return True
         return False
@@ -1,9 +1,12 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-                           QTableWidget, QTableWidgetItem, QLineEdit, QSpinBox, 
-                           QComboBox, QFileDialog, QMessageBox, QDialog, QHeaderView)
-from PyQt6.QtCore import Qt, pyqtSignal
+                           QLineEdit, QSpinBox, 
+                           QComboBox, QFileDialog, QMessageBox, QDialog, QTabWidget,
+                           QListWidget, QGridLayout)
+from PyQt6.QtCore import Qt, pyqtSignal, QThread
 from PyQt6.QtGui import QFont, QPixmap, QIcon
 from config import COLOR_ACCENT1, COLOR_ACCENT2, COLOR_CARD, MUSIC_DIR
+from ui.song_table import SongTableView
+from library_scanner import scan_folder
 import os
 
 class AddSongDialog(QDialog):
@@ -100,6 +103,19 @@ class AddSongDialog(QDialog):
         }
 
 
+class ScanWorker(QThread):
+    """Thread yang memindai folder musik tanpa memblokir GUI"""
+    scanned = pyqtSignal(list)  # Daftar data lagu baru
+
+    def __init__(self, folder, known_paths, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self.known_paths = known_paths
+
+    def run(self):
+        self.scanned.emit(scan_folder(self.folder, self.known_paths))
+
+
 class AdminDashboard(QWidget):
     """Dashboard Admin"""
     logout_signal = pyqtSignal()
@@ -108,9 +124,14 @@ class AdminDashboard(QWidget):
         super().__init__()
         self.data_manager = data_manager
         self.username = username
+        self.scan_worker = None
         self.init_ui()
         self.load_songs()
 
+        # Perubahan katalog diterapkan per baris, bukan dengan memuat ulang seluruh tabel
+        self.data_manager.add_listener(self.on_catalog_changed)
+        self.logout_signal.connect(lambda: self.data_manager.remove_listener(self.on_catalog_changed))
+
     def init_ui(self):
         """Inisialisasi UI"""
         main_layout = QHBoxLayout(self)
@@ -143,6 +164,7 @@ class AdminDashboard(QWidget):
 
         dashboard_btn = self.create_sidebar_button("📊 Dashboard")
         dashboard_btn.setMaximumHeight(45)
+        dashboard_btn.clicked.connect(lambda: self.switch_to_tab(0))  # Analytics tab
         sidebar_layout.addWidget(dashboard_btn)
 
         songs_btn = self.create_sidebar_button("🎵 Manage Songs")
@@ -156,6 +178,7 @@ class AdminDashboard(QWidget):
                 padding: 10px;
             }}
         """)
+        songs_btn.clicked.connect(lambda: self.switch_to_tab(1))  # Song library tab
         sidebar_layout.addWidget(songs_btn)
 
         sidebar_layout.addSpacing(20)
@@ -186,8 +209,22 @@ class AdminDashboard(QWidget):
 
         # Content area
         content = QWidget()
-        content_layout = QVBoxLayout(content)
-        content_layout.setContentsMargins(30, 30, 30, 30)
+        outer_layout = QVBoxLayout(content)
+        outer_layout.setContentsMargins(30, 30, 30, 30)
+
+        # Tab tanpa tab bar; berpindah lewat tombol sidebar
+        self.tabs = QTabWidget()
+        self.tabs.setStyleSheet("QTabWidget::pane { border: none; }")
+        self.tabs.tabBar().setVisible(False)
+        outer_layout.addWidget(self.tabs)
+
+        # Tab 1: Analytics
+        self.tabs.addTab(self.create_analytics_tab(), "📊 Dashboard")
+
+        # Tab 2: Song library
+        songs_tab = QWidget()
+        content_layout = QVBoxLayout(songs_tab)
+        content_layout.setContentsMargins(0, 0, 0, 0)
         content_layout.setSpacing(15)
 
         # Header
@@ -206,21 +243,88 @@ class AdminDashboard(QWidget):
         add_btn.clicked.connect(self.add_song)
         header_layout.addWidget(add_btn)
 
+        self.scan_btn = QPushButton("Scan Folder")
+        self.scan_btn.setMinimumWidth(150)
+        self.scan_btn.setMinimumHeight(40)
+        self.scan_btn.clicked.connect(self.scan_folder)
+        header_layout.addWidget(self.scan_btn)
+
         content_layout.addLayout(header_layout)
 
         # Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Title", "Artist", "Genre", "Action"])
-        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table = SongTableView([
+            ("edit", "Edit", COLOR_ACCENT1),
+            ("delete", "Delete", "#ff6b6b"),
+        ], button_width=80)
+        self.table.action_triggered.connect(self.on_song_action)
         self.table.setMinimumHeight(400)
         content_layout.addWidget(self.table)
 
+        self.tabs.addTab(songs_tab, "🎵 Manage Songs")
+        self.tabs.setCurrentIndex(1)
+
         # Add to main layout
         main_layout.addWidget(sidebar)
         main_layout.addWidget(content, 1)
 
+    def create_analytics_tab(self):
+        """Membuat tab analytics: ukuran katalog, lagu terpopuler dan jumlah lagu per genre"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(15)
+
+        title = QLabel("Dashboard")
+        title_font = QFont()
+        title_font.setPointSize(18)
+        title_font.setBold(True)
+        title.setFont(title_font)
+        layout.addWidget(title)
+
+        self.catalog_size_label = QLabel()
+        self.catalog_size_label.setStyleSheet(f"color: {COLOR_ACCENT2}; font-size: 14px; font-weight: bold;")
+        layout.addWidget(self.catalog_size_label)
+
+        grid = QGridLayout()
+        grid.setSpacing(15)
+        self.most_played_list = QListWidget()
+        self.most_playlisted_list = QListWidget()
+        self.genre_list = QListWidget()
+        sections = [
+            ("🔥 Most Played", self.most_played_list),
+            ("📋 In Most Playlists", self.most_playlisted_list),
+            ("🎼 Songs per Genre", self.genre_list),
+        ]
+        for column, (text, list_widget) in enumerate(sections):
+            label = QLabel(text)
+            label.setStyleSheet(f"color: {COLOR_ACCENT1}; font-weight: bold;")
+            list_widget.setStyleSheet(f"background-color: {COLOR_CARD}; border-radius: 8px; padding: 6px;")
+            grid.addWidget(label, 0, column)
+            grid.addWidget(list_widget, 1, column)
+        layout.addLayout(grid, 1)
+        return tab
+
+    def refresh_analytics(self):
+        """Isi tab analytics dari counter DataManager (tanpa menelusuri semua lagu/user)"""
+        analytics = self.data_manager.get_analytics()
+        self.catalog_size_label.setText(f"🎵 {analytics['catalog_size']} songs in catalog")
+
+        self.most_played_list.clear()
+        for song, plays in analytics["most_played"]:
+            self.most_played_list.addItem(f"{song.title} — {song.artist}  ({plays} plays)")
+        self.most_playlisted_list.clear()
+        for song, count in analytics["most_playlisted"]:
+            self.most_playlisted_list.addItem(f"{song.title} — {song.artist}  ({count} playlists)")
+        self.genre_list.clear()
+        for genre, count in analytics["genres"]:
+            self.genre_list.addItem(f"{genre or '-'}  ({count})")
+
+    def switch_to_tab(self, index):
+        """Beralih ke tab tertentu; tab analytics selalu diperbarui saat dibuka"""
+        if index == 0:
+            self.refresh_analytics()
+        self.tabs.setCurrentIndex(index)
+
     def create_sidebar_button(self, text):
         """Membuat tombol sidebar"""
         btn = QPushButton(text)
@@ -242,51 +346,30 @@ class AdminDashboard(QWidget):
 
     def load_songs(self):
         """Load songs ke table"""
-        self.table.setRowCount(0)
-        songs = self.data_manager.get_all_songs()
-
-        for song in songs:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-
-            self.table.setItem(row, 0, QTableWidgetItem(song.title))
-            self.table.setItem(row, 1, QTableWidgetItem(song.artist))
-            self.table.setItem(row, 2, QTableWidgetItem(song.genre))
-
-            # Action buttons
-            action_widget = QWidget()
-            action_layout = QHBoxLayout(action_widget)
-            action_layout.setContentsMargins(0, 0, 0, 0)
-
-            edit_btn = QPushButton("Edit")
-            edit_btn.setMaximumWidth(80)
-            edit_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {COLOR_ACCENT1};
-                    color: white;
-                    border-radius: 6px;
-                    padding: 5px;
-                    font-weight: bold;
-                }}
-            """)
-            edit_btn.clicked.connect(lambda checked, s=song: self.edit_song(s))
-            action_layout.addWidget(edit_btn)
-
-            delete_btn = QPushButton("Delete")
-            delete_btn.setMaximumWidth(80)
-            delete_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: #ff6b6b;
-                    color: white;
-                    border-radius: 6px;
-                    padding: 5px;
-                    font-weight: bold;
-                }}
-            """)
-            delete_btn.clicked.connect(lambda checked, s=song: self.delete_song(s))
-            action_layout.addWidget(delete_btn)
-
-            self.table.setCellWidget(row, 3, action_widget)
+        self.table.set_songs(self.data_manager.get_all_songs())
+
+    def on_catalog_changed(self, event, song):
+        """Perbarui satu baris tabel sesuai perubahan yang dilaporkan DataManager"""
+        model = self.table.song_model
+        if event == "song_added":
+            # Lagu baru disisipkan di depan library
+            model.insert_song(0, song)
+        elif event == "song_updated":
+            model.update_song(song)
+        elif event == "song_deleted":
+            model.remove_song(song)
+        elif event in ("songs_added", "songs_updated", "songs_deleted"):
+            # Perubahan massal: satu reset model lebih murah daripada ribuan operasi baris
+            self.load_songs()
+        if self.tabs.currentIndex() == 0:
+            self.refresh_analytics()
+
+    def on_song_action(self, action, song):
+        """Menangani tombol Edit/Delete di tabel"""
+        if action == "edit":
+            self.edit_song(song)
+        elif action == "delete":
+            self.delete_song(song)
 
     def add_song(self):
         """Add lagu baru"""
@@ -297,9 +380,28 @@ class AdminDashboard(QWidget):
                 data["title"], data["artist"], data["genre"],
                 data["file_path"]
             )
-            self.load_songs()
             QMessageBox.information(self, "Success", "Song added successfully")
 
+    def scan_folder(self):
+        """Pindai folder musik dan impor semua lagu yang belum ada di katalog"""
+        folder = QFileDialog.getExistingDirectory(self, "Select Music Folder", MUSIC_DIR)
+        if not folder:
+            return
+        known_paths = [song.file_path for song in self.data_manager.get_all_songs()]
+        self.scan_btn.setEnabled(False)
+        self.scan_btn.setText("Scanning...")
+        self.scan_worker = ScanWorker(folder, known_paths, self)
+        self.scan_worker.scanned.connect(self.on_scan_finished)
+        self.scan_worker.start()
+
+    def on_scan_finished(self, entries):
+        """Simpan hasil scan dengan satu panggilan bulk"""
+        self.scan_worker = None
+        self.scan_btn.setEnabled(True)
+        self.scan_btn.setText("Scan Folder")
+        self.data_manager.add_songs(entries)
+        QMessageBox.information(self, "Scan Complete", f"{len(entries)} new song(s) imported")
+
     def edit_song(self, song):
         """Edit lagu"""
         dialog = AddSongDialog(self, song)
@@ -310,7 +412,6 @@ class AdminDashboard(QWidget):
                 data["title"], data["artist"], data["genre"],
                 data["file_path"]
             )
-            self.load_songs()
             QMessageBox.information(self, "Success", "Song updated successfully")
 
     def delete_song(self, song):
@@ -322,5 +423,4 @@ class AdminDashboard(QWidget):
         )
         if reply == QMessageBox.StandardButton.Yes:
             self.data_manager.delete_song(song.song_id)
-            self.load_songs()
             QMessageBox.information(self, "Success", "Song deleted successfully")
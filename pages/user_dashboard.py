@@ -1,14 +1,16 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-                           QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView, QTabWidget, QListWidget, QListWidgetItem, QSlider,
+                           QMessageBox, QTabWidget, QListWidget, QListWidgetItem, QSlider,
                            QGroupBox, QLineEdit, QDialog, QDialogButtonBox, QFormLayout, QFileDialog)
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer
-from PyQt6.QtGui import QFont, QPixmap, QPainter, QPainterPath, QPen, QColor, QBrush
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QFont, QPixmap
 from config import COLOR_ACCENT1, COLOR_ACCENT2, MUSIC_DIR
-import pygame
+from ui.song_table import SongTableView
+from ui.avatar_cache import avatar_cache
+from player import PlayerEngine
+from shuffle import ShuffleSession
+from play_history import ListenTimer
 import os
-import time
 import shutil
-import random
 
 class UserDashboard(QWidget):
     """Dashboard User"""
@@ -24,26 +26,33 @@ class UserDashboard(QWidget):
         self.song_length = 0
         self.is_seeking = False
         
-        # Track posisi manual
-        self.play_start_time = 0  # Waktu saat mulai play
-        self.last_position = 0    # Posisi terakhir saat pause (dalam detik)
-        self.seek_position = 0    # Posisi yang diinginkan saat seek (dalam detik)
-        
         # Track playlist dan random mode
         self.playlist_finished = False
-        self.played_songs = set()  # Track lagu yang sudah diputar untuk hindari repeat
-        
-        # Timer untuk progress dan auto-play detection
-        self.progress_timer = QTimer()
-        self.progress_timer.timeout.connect(self.update_progress)
-        
-        # Timer khusus untuk deteksi lagu selesai
-        self.end_check_timer = QTimer()
-        self.end_check_timer.timeout.connect(self.check_song_end)
+        # Urutan acak tanpa repeat atas katalog; dibuat saat pertama dibutuhkan
+        self.shuffle = None
+
+        # Lagu berikutnya yang sudah diantrekan di mixer (transisi tanpa jeda)
+        self.queued_song = None
+        self.queued_playlist_finished = False
+
+        # Lama lagu saat ini didengar, dicatat ke riwayat putar saat lagu berganti/berhenti
+        self.listen_timer = ListenTimer()
+
+        # Widget profil di sidebar, dibuat oleh update_sidebar_profile
+        self.sidebar_avatar_label = None
+        self.sidebar_username_label = None
         
-        # Inisialisasi pygame mixer
-        if not pygame.mixer.get_init():
-            pygame.mixer.init()
+        # Semua I/O audio (pygame mixer) berjalan di thread PlayerEngine;
+        # posisi, durasi dan akhir lagu datang kembali lewat signal
+        self.engine = PlayerEngine(self)
+        self.engine.track_started.connect(self.on_track_started)
+        self.engine.track_ended.connect(self.song_finished)
+        self.engine.position_changed.connect(self.update_progress)
+        self.engine.duration_resolved.connect(self.on_duration_resolved)
+        self.engine.error.connect(self.on_player_error)
+
+        # Lagu yang ditambah/dihapus admin ikut diperbarui di sesi shuffle
+        self.data_manager.add_listener(self.on_catalog_changed)
         
         self.init_ui()
         self.load_library()
@@ -53,6 +62,10 @@ class UserDashboard(QWidget):
 
     def logout_action(self):
         """Menangani aksi logout"""
+        # Hentikan lagu dan thread engine milik dashboard ini
+        self.stop_song()
+        self.engine.shutdown()
+        self.data_manager.remove_listener(self.on_catalog_changed)
         self.logout_signal.emit()
 
     def init_ui(self):
@@ -167,11 +180,19 @@ class UserDashboard(QWidget):
         lib_title.setFont(lib_font)
         library_layout.addWidget(lib_title)
 
-        self.library_table = QTableWidget()
-        self.library_table.setColumnCount(4)
-        self.library_table.setHorizontalHeaderLabels(["Title", "Artist", "Genre", "Action"])
-        self.library_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.library_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        # Kotak pencarian (title, artist, genre) berbasis search index di DataManager
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 Search title, artist or genre...")
+        self.search_input.setMinimumHeight(35)
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self.load_library)
+        library_layout.addWidget(self.search_input)
+
+        self.library_table = SongTableView([
+            ("play", "Play", COLOR_ACCENT1),
+            ("add", "+ Add", COLOR_ACCENT2),
+        ])
+        self.library_table.action_triggered.connect(self.on_library_action)
         self.library_table.setMinimumHeight(300)
         library_layout.addWidget(self.library_table)
 
@@ -189,11 +210,11 @@ class UserDashboard(QWidget):
         pl_title.setFont(pl_font)
         playlist_layout.addWidget(pl_title)
 
-        self.playlist_table = QTableWidget()
-        self.playlist_table.setColumnCount(4)
-        self.playlist_table.setHorizontalHeaderLabels(["Title", "Artist", "Genre", "Action"])
-        self.playlist_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.playlist_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.playlist_table = SongTableView([
+            ("play", "Play", COLOR_ACCENT1),
+            ("remove", "Remove", "#ff6b6b"),
+        ])
+        self.playlist_table.action_triggered.connect(self.on_playlist_action)
         self.playlist_table.setMinimumHeight(300)
         playlist_layout.addWidget(self.playlist_table)
 
@@ -466,165 +487,44 @@ class UserDashboard(QWidget):
         """)
         return btn
 
-    def make_circular_pixmap(self, pixmap, size):
-        """Membuat pixmap bulat dari gambar persegi"""
-        # Resize to square
-        square_pixmap = pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatioByExpanding, 
-                                     Qt.TransformationMode.SmoothTransformation)
-        
-        # Create circular pixmap
-        circular = QPixmap(size, size)
-        circular.fill(Qt.GlobalColor.transparent)
-        
-        painter = QPainter(circular)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Create circular clipping path
-        path = QPainterPath()
-        path.addEllipse(0, 0, size, size)
-        painter.setClipPath(path)
-        
-        # Draw image
-        painter.drawPixmap(0, 0, square_pixmap)
-
-        painter.end()
-        
-        return circular
-
-    def create_default_avatar(self, size=35):
-        """Membuat avatar bulat default"""
-        pixmap = QPixmap(size, size)
-        pixmap.fill(Qt.GlobalColor.transparent)
-        
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Draw circle
-        painter.setBrush(QBrush(QColor("#333")))
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawEllipse(0, 0, size, size)
-        
-        # Draw avatar icon
-        painter.setPen(QColor("white"))
-        font = painter.font()
-        font.setPointSize(size // 2)
-        painter.setFont(font)
-        painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "👤")
-        
-        painter.end()
-        return pixmap
-
     def load_profile_image(self):
         """Memuat dan menampilkan gambar profil"""
         profile_image = self.data_manager.get_user_profile_image(self.username)
-        
-        if profile_image and os.path.exists(profile_image):
-            # Load image and make it circular
-            pixmap = QPixmap(profile_image)
-            circular_pixmap = self.make_circular_pixmap(pixmap, 120)
-            self.profile_image_label.setPixmap(circular_pixmap)
-            self.remove_profile_btn.setVisible(True)
-        else:
-            # Create default avatar
-            default_pixmap = self.create_default_avatar(120)
-            self.profile_image_label.setPixmap(default_pixmap)
-            self.remove_profile_btn.setVisible(False)
+        # Avatar bulat diambil dari cache; hanya dirender ulang bila gambarnya berubah
+        self.profile_image_label.setPixmap(avatar_cache.get(profile_image, 120))
+        self.remove_profile_btn.setVisible(bool(profile_image) and os.path.exists(profile_image))
 
     def load_library(self):
-        """Memuat lagu-lagu perpustakaan"""
-        self.library_table.setRowCount(0)
-        songs = self.data_manager.get_all_songs()
-
-        for song in songs:
-            row = self.library_table.rowCount()
-            self.library_table.insertRow(row)
-
-            self.library_table.setItem(row, 0, QTableWidgetItem(song.title))
-            self.library_table.setItem(row, 1, QTableWidgetItem(song.artist))
-            self.library_table.setItem(row, 2, QTableWidgetItem(song.genre))
-
-            # Tombol aksi
-            action_widget = QWidget()
-            action_layout = QHBoxLayout(action_widget)
-            action_layout.setContentsMargins(0, 0, 0, 0)
-
-            play_btn = QPushButton("Play")
-            play_btn.setMaximumWidth(70)
-            play_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {COLOR_ACCENT1};
-                    color: white;
-                    border-radius: 6px;
-                    padding: 5px;
-                    font-weight: bold;
-                }}
-            """)
-            play_btn.clicked.connect(lambda checked, s=song: self.play_song(s))
-            action_layout.addWidget(play_btn)
-
-            add_btn = QPushButton("+ Add")
-            add_btn.setMaximumWidth(70)
-            add_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {COLOR_ACCENT2};
-                    color: white;
-                    border-radius: 6px;
-                    padding: 5px;
-                    font-weight: bold;
-                }}
-            """)
-            add_btn.clicked.connect(lambda checked, s=song: self.add_to_playlist(s))
-            action_layout.addWidget(add_btn)
-
-            self.library_table.setCellWidget(row, 3, action_widget)
+        """Memuat lagu-lagu perpustakaan (difilter oleh kotak pencarian bila terisi)"""
+        query = self.search_input.text().strip()
+        if query:
+            songs = self.data_manager.search_songs(query)
+            if not songs:
+                # Tidak ada kecocokan prefix (mungkin typo): pakai fuzzy search
+                songs = self.data_manager.fuzzy_search(query, 20)
+        else:
+            songs = self.data_manager.get_all_songs()
+        self.library_table.set_songs(songs)
 
     def load_playlist(self):
         """Memuat playlist pengguna"""
-        self.playlist_table.setRowCount(0)
-        songs = self.data_manager.get_user_playlist(self.username)
-
-        for song in songs:
-            row = self.playlist_table.rowCount()
-            self.playlist_table.insertRow(row)
-
-            self.playlist_table.setItem(row, 0, QTableWidgetItem(song.title))
-            self.playlist_table.setItem(row, 1, QTableWidgetItem(song.artist))
-            self.playlist_table.setItem(row, 2, QTableWidgetItem(song.genre))
-
-            # Tombol aksi
-            action_widget = QWidget()
-            action_layout = QHBoxLayout(action_widget)
-            action_layout.setContentsMargins(0, 0, 0, 0)
-
-            play_btn = QPushButton("Play")
-            play_btn.setMaximumWidth(70)
-            play_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {COLOR_ACCENT1};
-                    color: white;
-                    border-radius: 6px;
-                    padding: 5px;
-                    font-weight: bold;
-                }}
-            """)
-            play_btn.clicked.connect(lambda checked, s=song: self.play_song(s))
-            action_layout.addWidget(play_btn)
-
-            remove_btn = QPushButton("Remove")
-            remove_btn.setMaximumWidth(70)
-            remove_btn.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: #ff6b6b;
-                    color: white;
-                    border-radius: 6px;
-                    padding: 5px;
-                    font-weight: bold;
-                }}
-            """)
-            remove_btn.clicked.connect(lambda checked, s=song: self.remove_from_playlist(s))
-            action_layout.addWidget(remove_btn)
-
-            self.playlist_table.setCellWidget(row, 3, action_widget)
+        self.playlist_table.set_songs(self.data_manager.get_user_playlist(self.username))
+        # Playlist berubah: lagu berikutnya yang sudah diantrekan bisa jadi tidak berlaku lagi
+        self.queue_next_song()
+
+    def on_library_action(self, action, song):
+        """Menangani tombol aksi di tabel library"""
+        if action == "play":
+            self.play_song(song)
+        elif action == "add":
+            self.add_to_playlist(song)
+
+    def on_playlist_action(self, action, song):
+        """Menangani tombol aksi di tabel playlist"""
+        if action == "play":
+            self.play_song(song)
+        elif action == "remove":
+            self.remove_from_playlist(song)
 
     def add_to_playlist(self, song):
         """Menambah lagu ke playlist"""
@@ -641,53 +541,95 @@ class UserDashboard(QWidget):
             QMessageBox.information(self, "Success", f"'{song.title}' removed from playlist")
 
     def play_song(self, song):
-        """Memainkan lagu menggunakan pygame"""
+        """Memainkan lagu lewat PlayerEngine (load dan decode tidak memblokir GUI)"""
         self.stop_song()  # Hentikan lagu saat ini
 
         self.current_playing_song = song
-        self.played_songs.add(song.song_id)  # Track lagu yang sudah diputar
+        self.get_shuffle().mark_played(song)  # Track lagu yang sudah diputar
         self.now_playing.setText(f"♫ {song.title} — {song.artist}")
         self.is_paused = False
         self.progress_slider.setValue(0)  # Reset slider
-        self.last_position = 0
-        self.seek_position = 0
 
         # Coba muat dan mainkan file
         if song.file_path and os.path.exists(song.file_path):
-            try:
-                pygame.mixer.music.load(song.file_path)
-                sound = pygame.mixer.Sound(song.file_path)
-                self.song_length = sound.get_length()
-                self.total_time_label.setText(self.format_time(self.song_length))
-                
-                # Mulai play
-                pygame.mixer.music.play(-1 if self.is_looping else 1)
-                
-                # Set waktu mulai untuk tracking manual
-                self.play_start_time = time.time()
-                
-                # Mulai timer
-                self.progress_timer.start(100)  # Update lebih cepat (100ms)
-                self.end_check_timer.start(500)  # Cek lagu selesai setiap 500ms
-                self.play_btn.setEnabled(False)
-                self.pause_btn.setEnabled(True)
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to play song: {str(e)}")
-                self.song_length = 0
+            # Durasi dari metadata; bila belum ada, engine yang menghitungnya
+            self.song_length = song.duration
+            self.total_time_label.setText(self.format_time(self.song_length))
+            self.engine.play(song, song.file_path, song.duration)
+            self.listen_timer.start()
+            self.play_btn.setEnabled(False)
+            self.pause_btn.setEnabled(True)
+
+            # Siapkan lagu berikutnya di antrean mixer selagi lagu ini diputar
+            self.queue_next_song()
         else:
             self.song_length = 0
             self.total_time_label.setText("0:00")
             self.play_btn.setEnabled(False)
             self.pause_btn.setEnabled(True)
 
+    def on_track_started(self, song, length):
+        """Engine mulai memutar sebuah lagu (dari play atau dari antrean)"""
+        if song is self.queued_song:
+            self.advance_to_queued_song(length)
+        elif song is self.current_playing_song:
+            self.song_length = length
+            self.total_time_label.setText(self.format_time(length))
+
+    def on_duration_resolved(self, song, length):
+        """Simpan durasi yang dihitung engine agar tidak perlu dihitung lagi"""
+        self.data_manager.set_song_duration(song.song_id, length)
+        # Durasi hasil decode bisa tiba setelah lagu mulai diputar
+        if song is self.current_playing_song:
+            self.song_length = length
+            self.total_time_label.setText(self.format_time(length))
+
+    def on_player_error(self, song, message):
+        """Tampilkan error dari engine"""
+        QMessageBox.critical(self, "Error", f"Failed to play song: {message}")
+        if song is self.current_playing_song:
+            self.song_length = 0
+
+    def queue_next_song(self):
+        """Tentukan lagu berikutnya lebih awal dan antrekan di mixer agar transisi tanpa jeda"""
+        if self.is_looping or not self.current_playing_song:
+            return
+        song, playlist_finished = self.choose_next_song()
+        if not song or not song.file_path or not os.path.exists(song.file_path):
+            # Antrean lama (mis. lagu yang baru dihapus dari playlist) tidak boleh ikut diputar
+            if self.queued_song is not None:
+                self.engine.unqueue()
+            self.queued_song = None
+            self.queued_playlist_finished = False
+            return
+        # Antrean mixer hanya berisi satu lagu; antrean lama otomatis diganti
+        self.engine.queue(song, song.file_path, song.duration)
+        self.queued_song = song
+        self.queued_playlist_finished = playlist_finished
+
+    def advance_to_queued_song(self, length):
+        """Mixer sudah berpindah ke lagu antrean; UI cukup menyusul tanpa load ulang"""
+        song = self.queued_song
+        self.queued_song = None
+        self.playlist_finished = self.queued_playlist_finished
+
+        self.finish_listening()
+        self.current_playing_song = song
+        self.listen_timer.start()
+        self.get_shuffle().mark_played(song)
+        self.now_playing.setText(f"♫ {song.title} — {song.artist}")
+        self.song_length = length
+        self.total_time_label.setText(self.format_time(self.song_length))
+
+        self.queue_next_song()
+
     def play_current(self):
         """Memainkan lagu saat ini"""
         if self.current_playing_song:
             if self.is_paused:
                 # Lanjutkan dari posisi saat ini
-                pygame.mixer.music.unpause()
-                self.progress_timer.start(100)
+                self.engine.resume()
+                self.listen_timer.resume()
                 self.is_paused = False
                 self.pause_btn.setText("⏸ Pause")
             else:
@@ -697,50 +639,30 @@ class UserDashboard(QWidget):
 
     def pause_song(self):
         """Menjeda lagu"""
-        if pygame.mixer.music.get_busy() and not self.is_paused:
-            pygame.mixer.music.pause()
-            self.progress_timer.stop()
-            self.end_check_timer.stop()  # Stop end check saat pause
+        if self.current_playing_song and not self.is_paused:
+            self.engine.pause()
+            self.listen_timer.pause()
             self.is_paused = True
-            
-            # Simpan posisi saat ini sebelum pause
-            if self.song_length > 0:
-                current_time = time.time()
-                elapsed = current_time - self.play_start_time
-                self.last_position = elapsed % self.song_length if self.is_looping else min(elapsed, self.song_length)
-                
             self.pause_btn.setText("▶ Resume")
         elif self.is_paused:
-            # Resume dari posisi terakhir
-            try:
-                # Stop dan load ulang dari posisi terakhir
-                pygame.mixer.music.stop()
-                pygame.mixer.music.load(self.current_playing_song.file_path)
-                pygame.mixer.music.play(-1 if self.is_looping else 1)
-                
-                # Coba set posisi
-                try:
-                    pygame.mixer.music.set_pos(self.last_position)
-                except:
-                    # Fallback: atur waktu mulai berdasarkan posisi
-                    pass
-                
-                # Update waktu mulai untuk tracking
-                self.play_start_time = time.time() - self.last_position
-                
-                self.progress_timer.start(100)
-                self.end_check_timer.start(500)  # Start kembali end check
-                self.is_paused = False
-                self.pause_btn.setText("⏸ Pause")
-            except Exception as e:
-                print(f"Resume error: {e}")
-                QMessageBox.warning(self, "Error", f"Failed to resume: {str(e)}")
+            # Resume dari posisi terakhir: stream masih dimuat, cukup unpause
+            self.engine.resume()
+            self.listen_timer.resume()
+            self.is_paused = False
+            self.pause_btn.setText("⏸ Pause")
+
+    def finish_listening(self):
+        """Catat lagu saat ini ke riwayat putar beserta lama didengar"""
+        listened = self.listen_timer.stop()
+        if listened and self.current_playing_song:
+            started_at, seconds = listened
+            self.data_manager.record_play(self.username, self.current_playing_song.song_id, seconds, started_at)
 
     def stop_song(self):
         """Menghentikan lagu"""
-        pygame.mixer.music.stop()
-        self.progress_timer.stop()
-        self.end_check_timer.stop()  # Jangan lupa stop timer ini juga
+        self.finish_listening()
+        self.engine.stop()
+        self.queued_song = None  # stop() juga mengosongkan antrean mixer
         self.progress_slider.setValue(0)
         self.song_length = 0
         self.current_playing_song = None
@@ -751,110 +673,108 @@ class UserDashboard(QWidget):
         self.pause_btn.setText("⏸ Pause")
         self.current_time_label.setText("0:00")
         self.total_time_label.setText("0:00")
-        
-        # Reset tracking variables
-        self.last_position = 0
-        self.seek_position = 0
-        self.play_start_time = 0
-
-    def check_song_end(self):
-        """Memeriksa apakah lagu telah berakhir dan memainkan berikutnya secara otomatis"""
-        if self.is_looping or self.is_paused or not self.current_playing_song:
-            return
-            
-        if not pygame.mixer.music.get_busy():
-            # Musik sudah tidak aktif (berarti sudah selesai)
-            print("Song ended, playing next...")
-            self.end_check_timer.stop()
-            self.next_song()
 
     def next_song(self):
         """Memainkan lagu berikutnya dengan prioritas: playlist > artis sama > acak, tanpa pengulangan hingga semua dimainkan"""
+        if self.queued_song:
+            # Pakai lagu yang sudah dipilih dan diantrekan sebelumnya
+            song, playlist_finished = self.queued_song, self.queued_playlist_finished
+        else:
+            song, playlist_finished = self.choose_next_song()
+        self.playlist_finished = playlist_finished
+
+        if song:
+            self.play_song(song)
+        else:
+            # Semua lagu sudah diputar
+            if self.current_playing_song:
+                QMessageBox.information(self, "All Songs Played", "All songs have been played. Playback stopped.")
+            self.stop_song()
+
+    def choose_next_song(self):
+        """Pilih lagu berikutnya tanpa memutarnya dan tanpa mengubah state.
+
+        Kembalikan (lagu, playlist_finished); lagu bernilai None bila semua lagu
+        sudah diputar. Prioritas: playlist > rekomendasi > artis sama > acak.
+        """
         # Jika sudah dalam mode random (playlist habis), langsung random
-        if self.playlist_finished:
-            self.play_random_from_library(silent=True)
-            return
-        
-        # Cek dulu playlist user
-        playlist_songs = self.data_manager.get_user_playlist(self.username)
-        
-        if playlist_songs and len(playlist_songs) > 0:
-            # Ada playlist, cari next song dalam playlist
-            if not self.current_playing_song:
-                # Jika belum ada lagu yang dimainkan, mulai dari pertama di playlist
-                self.play_song(playlist_songs[0])
-                return
-                
-            # Cari index lagu saat ini di playlist
-            current_index = -1
-            for i, song in enumerate(playlist_songs):
-                if song.song_id == self.current_playing_song.song_id:
-                    current_index = i
-                    break
-            
-            if current_index >= 0:
-                # Ada di playlist, cek apakah ada next song
+        if not self.playlist_finished:
+            playlist_songs = self.data_manager.get_user_playlist(self.username)
+            if playlist_songs:
+                if not self.current_playing_song:
+                    # Jika belum ada lagu yang dimainkan, mulai dari pertama di playlist
+                    return playlist_songs[0], False
+
+                # Cari index lagu saat ini di playlist
+                current_index = -1
+                for i, song in enumerate(playlist_songs):
+                    if song.song_id == self.current_playing_song.song_id:
+                        current_index = i
+                        break
+
+                if current_index < 0:
+                    # Lagu saat ini tidak ada di playlist, mulai dari awal playlist
+                    return playlist_songs[0], False
                 if current_index < len(playlist_songs) - 1:
-                    # Ada next song di playlist
-                    next_song_obj = playlist_songs[current_index + 1]
-                    self.play_song(next_song_obj)
-                    return
-                else:
-                    # Sudah di akhir playlist, set flag dan lanjut ke random dari library
-                    self.playlist_finished = True
-                    self.play_random_from_library(silent=True)
-                    return
-            else:
-                # Lagu saat ini tidak ada di playlist, mulai dari awal playlist
-                self.play_song(playlist_songs[0])
-                return
-        else:
-            # Playlist kosong, langsung random dari library
-            self.playlist_finished = True
-            self.play_random_from_library(silent=True)
+                    return playlist_songs[current_index + 1], False
+            # Playlist kosong atau sudah di akhir: lanjut random dari library
+
+        return self.choose_random_song(), True
+
+    def get_shuffle(self):
+        """Sesi shuffle aktif; katalog hanya dibaca sekali saat sesi dibuat"""
+        if self.shuffle is None:
+            self.shuffle = ShuffleSession(
+                self.data_manager.get_all_songs(),
+                # Lagu yang sudah dihapus dari katalog dilewati
+                is_valid=lambda song: self.data_manager.get_song_by_id(song.song_id) is song,
+                songs_by_artist=self.data_manager.get_songs_by_artist,
+            )
+        return self.shuffle
+
+    def on_catalog_changed(self, event, songs):
+        """Perbarui sesi shuffle saat admin menambah, mengedit atau menghapus lagu"""
+        if self.shuffle is None:
+            return
+        if event in ("song_added", "song_updated", "song_deleted"):
+            songs = [songs]
+        for song in songs:
+            if event in ("song_added", "songs_added"):
+                self.shuffle.add(song)
+            elif event in ("song_updated", "songs_updated"):
+                self.shuffle.update(song)
+            elif event in ("song_deleted", "songs_deleted") and self.data_manager.get_song_by_id(song.song_id) is None:
+                self.shuffle.remove(song)
+
+    def choose_random_song(self):
+        """Pilih lagu yang belum diputar: paling mirip (dari playlist semua user) > artis sama > acak"""
+        shuffle = self.get_shuffle()
+        if not self.current_playing_song:
+            return shuffle.next_song()
+        similar = self.data_manager.recommend_song(self.current_playing_song.song_id, skip=shuffle.is_played)
+        if similar is not None:
+            return similar
+        return shuffle.next_song(self.current_playing_song.artist)
 
     def play_random_from_library(self, silent=False):
-        """Memainkan lagu acak dari perpustakaan dengan prioritas artis sama, menghindari lagu yang sudah dimainkan"""
-        all_songs = self.data_manager.get_all_songs()
-        if not all_songs:
+        """Memainkan lagu dari perpustakaan (rekomendasi > artis sama > acak), menghindari lagu yang sudah dimainkan"""
+        if self.data_manager.get_song_by_index(0) is None:
             if not silent:
                 QMessageBox.information(self, "No Songs", "No songs available in library")
             return
-        
-        if not self.current_playing_song:
-            # Jika belum ada lagu, pilih random dari semua
-            available_songs = [song for song in all_songs if song.song_id not in self.played_songs]
-            if available_songs:
-                random_song = random.choice(available_songs)
-                self.play_song(random_song)
-            else:
-                if not silent:
-                    QMessageBox.information(self, "All Songs Played", "All songs have been played. Playback stopped.")
-                self.stop_song()
-            return
-        
-        # Cari lagu dengan artis yang sama yang belum diputar
-        current_artist = self.current_playing_song.artist
-        same_artist_songs = [song for song in all_songs if song.song_id != self.current_playing_song.song_id and song.artist == current_artist and song.song_id not in self.played_songs]
-        
-        if same_artist_songs:
-            random_song = random.choice(same_artist_songs)
-            self.play_song(random_song)
-            if not silent:
-                self.now_playing.setText(f"♫ {random_song.title} — {random_song.artist} (Same Artist)")
-        else:
-            # Tidak ada artis sama yang belum diputar, pilih random dari semua yang belum diputar
-            available_songs = [song for song in all_songs if song.song_id not in self.played_songs]
-            
-            if available_songs:
-                random_song = random.choice(available_songs)
-                self.play_song(random_song)
-                if not silent:
-                    self.now_playing.setText(f"♫ {random_song.title} — {random_song.artist} (Random)")
-            else:
-                # Semua lagu sudah diputar
+
+        previous_song = self.current_playing_song
+        random_song = self.choose_random_song()
+        if random_song is None:
+            if previous_song or not silent:
                 QMessageBox.information(self, "All Songs Played", "All songs have been played. Playback stopped.")
-                self.stop_song()
+            self.stop_song()
+            return
+
+        self.play_song(random_song)
+        if previous_song and not silent:
+            label = "Same Artist" if random_song.artist == previous_song.artist else "Random"
+            self.now_playing.setText(f"♫ {random_song.title} — {random_song.artist} ({label})")
 
     def prev_song(self):
         """Memainkan lagu sebelumnya dengan prioritas playlist"""
@@ -895,138 +815,54 @@ class UserDashboard(QWidget):
             # Playlist kosong, cari prev song dari history atau random
             self.play_random_from_library(silent=True)
 
-    def update_progress(self):
-        """Update progress slider secara realtime dengan tracking manual"""
+    def update_progress(self, song, elapsed):
+        """Update progress slider dari posisi yang dikirim PlayerEngine"""
+        if song is not self.current_playing_song or self.is_paused:
+            return
         if not self.is_seeking and self.song_length > 0:
-            if pygame.mixer.music.get_busy() and not self.is_paused:
-                # Hitung posisi berdasarkan waktu
-                current_time = time.time()
-                elapsed = current_time - self.play_start_time
-                
-                # Handle looping
-                if self.is_looping:
-                    elapsed = elapsed % self.song_length
-                elif elapsed > self.song_length:
-                    # Song sudah selesai
-                    elapsed = self.song_length
-                    self.song_finished()
-                
-                # Hitung persentase (0-1000 untuk lebih smooth)
-                value = int((elapsed / self.song_length) * 1000)
-                value = min(1000, max(0, value))  # Clamp value
-                
-                # Update slider TANPA trigger event
-                self.progress_slider.blockSignals(True)  # Blok sinyal sementara
-                self.progress_slider.setValue(value)
-                self.progress_slider.blockSignals(False)  # Buka blokir
-                
-                # Update time label
-                self.current_time_label.setText(self.format_time(elapsed))
-
-    def song_finished(self):
-        """Dipanggil ketika lagu selesai (terdeteksi oleh tracking progress)"""
-        if not self.is_looping and not self.is_paused:
-            print("Song finished detected in update_progress")
-            self.progress_timer.stop()
-            self.end_check_timer.stop()
+            # Hitung persentase (0-1000 untuk lebih smooth)
+            value = int((elapsed / self.song_length) * 1000)
+            value = min(1000, max(0, value))  # Clamp value
+            
+            # Update slider TANPA trigger event
+            self.progress_slider.blockSignals(True)  # Blok sinyal sementara
+            self.progress_slider.setValue(value)
+            self.progress_slider.blockSignals(False)  # Buka blokir
             
-            # Auto-play next song dengan delay kecil
-            QTimer.singleShot(200, self.next_song)  # Delay 200ms
+            # Update time label
+            self.current_time_label.setText(self.format_time(elapsed))
+
+    def song_finished(self, song):
+        """Dipanggil tepat sekali saat lagu selesai dan tidak ada lagu antrean yang menyambung"""
+        if song is not self.current_playing_song or self.is_looping:
+            return  # Signal milik lagu yang sudah diganti
+        self.next_song()
 
     def seek_song(self, position):
         """Melompat ke posisi dalam lagu"""
         if self.current_playing_song and self.song_length > 0:
             # Konversi posisi 0-100, konversi ke detik
-            self.seek_position = (position / 100) * self.song_length
-            
-            try:
-                # Simpan state
-                was_playing = pygame.mixer.music.get_busy() and not self.is_paused
-                current_volume = pygame.mixer.music.get_volume() if pygame.mixer.music.get_busy() else 1.0
-                
-                # Stop musik
-                pygame.mixer.music.stop()
-                self.progress_timer.stop()
-                
-                # Load ulang musik
-                pygame.mixer.music.load(self.current_playing_song.file_path)
-                
-                # Play dari posisi yang diinginkan
-                pygame.mixer.music.play(-1 if self.is_looping else 1)
-                
-                # Coba set posisi
-                try:
-                    pygame.mixer.music.set_pos(self.seek_position)
-                except:
-                    # Jika set_pos tidak didukung, kita atur waktu mulai manual
-                    pass
-                
-                # Update waktu mulai untuk tracking
-                self.play_start_time = time.time() - self.seek_position
-                self.last_position = self.seek_position
-                
-                # Set volume kembali
-                pygame.mixer.music.set_volume(current_volume)
-                
-                # Update UI
-                self.progress_slider.setValue(int((position / 100) * 1000))
-                self.current_time_label.setText(self.format_time(self.seek_position))
-                
-                # Jika sebelumnya paused, tetap paused
-                if not was_playing:
-                    pygame.mixer.music.pause()
-                    self.is_paused = True
-                    self.pause_btn.setText("▶ Resume")
-                else:
-                    # Lanjutkan timer
-                    self.progress_timer.start(100)
-                    
-            except Exception as e:
-                print(f"Seek error: {e}")
-                QMessageBox.warning(self, "Seek Error", f"Cannot seek: {str(e)}")
-                
-                # Reset ke posisi sebelumnya
-                if pygame.mixer.music.get_busy():
-                    self.progress_timer.start(100)
+            seek_position = (position / 100) * self.song_length
+
+            # Engine melakukan seek di stream yang sedang dimuat; status pause tetap
+            self.engine.seek(seek_position)
+
+            # Update UI
+            self.progress_slider.setValue(int((position / 100) * 1000))
+            self.current_time_label.setText(self.format_time(seek_position))
 
     def toggle_loop(self):
         """Mengaktifkan/nonaktifkan mode loop"""
         self.is_looping = not self.is_looping
         self.loop_btn.setText("🔁 Loop (ON)" if self.is_looping else "🔁 Loop")
-        
-        if self.current_playing_song and pygame.mixer.music.get_busy():
-            # Restart dengan pengaturan loop baru
-            try:
-                # Simpan posisi saat ini
-                if self.song_length > 0:
-                    current_time = time.time()
-                    current_pos = current_time - self.play_start_time
-                    if self.is_looping:
-                        current_pos = current_pos % self.song_length
-                    else:
-                        current_pos = min(current_pos, self.song_length)
-                
-                # Stop dan restart
-                pygame.mixer.music.stop()
-                pygame.mixer.music.load(self.current_playing_song.file_path)
-                pygame.mixer.music.play(-1 if self.is_looping else 1)
-                
-                # Coba set posisi kembali
-                try:
-                    pygame.mixer.music.set_pos(current_pos)
-                except:
-                    pass
-                
-                # Update waktu mulai
-                self.play_start_time = time.time() - current_pos
-                
-            except Exception as e:
-                print(f"Toggle loop error: {e}")
+        self.engine.set_looping(self.is_looping)
+
+        # Saat loop aktif antrean tidak pernah diputar; saat dimatikan, antrekan lagu berikutnya
+        self.queue_next_song()
 
     def on_slider_pressed(self):
         """Dipanggil saat user mulai drag slider"""
-        self.is_seeking = True
-        self.progress_timer.stop()
+        self.is_seeking = True  # Update posisi dari engine diabaikan selama drag
         
         # Simpan posisi awal drag
         self.drag_start_value = self.progress_slider.value()
@@ -1068,43 +904,28 @@ class UserDashboard(QWidget):
         self.tabs.setCurrentIndex(index)
 
     def update_sidebar_profile(self):
-        """Memperbarui sidebar dengan gambar profil"""
-        # Remove existing profile
-        for i in reversed(range(self.sidebar_layout.count())):
-            widget = self.sidebar_layout.itemAt(i).widget()
-            if widget and hasattr(widget, 'objectName') and widget.objectName() == 'profile_widget':
-                widget.setParent(None)
-
-        # Create new profile widget
-        profile_widget = QWidget()
-        profile_widget.setObjectName('profile_widget')
-        profile_layout = QHBoxLayout(profile_widget)
-        profile_layout.setContentsMargins(0, 0, 0, 0)
-        profile_layout.setSpacing(10)
-
-        # Profile image or default
-        profile_image = self.data_manager.get_user_profile_image(self.username)
-        image_label = QLabel()
-        image_label.setFixedSize(35, 35)
-        
-        if profile_image and os.path.exists(profile_image):
-            pixmap = QPixmap(profile_image)
-            circular = self.make_circular_pixmap(pixmap, 35)
-            image_label.setPixmap(circular)
-        else:
-            default_pixmap = self.create_default_avatar(35)
-            image_label.setPixmap(default_pixmap)
-        
-        profile_layout.addWidget(image_label)
-        
-        # Username
-        username_label = QLabel(self.username)
-        username_label.setStyleSheet("color: #b388ff; font-size: 12px; font-weight: bold;")
-        profile_layout.addWidget(username_label)
-        profile_layout.addStretch()
+        """Memperbarui foto dan username di sidebar (widget dibuat sekali, lalu hanya diperbarui)"""
+        if self.sidebar_avatar_label is None:
+            profile_widget = QWidget()
+            profile_layout = QHBoxLayout(profile_widget)
+            profile_layout.setContentsMargins(0, 0, 0, 0)
+            profile_layout.setSpacing(10)
+
+            self.sidebar_avatar_label = QLabel()
+            self.sidebar_avatar_label.setFixedSize(35, 35)
+            profile_layout.addWidget(self.sidebar_avatar_label)
+
+            self.sidebar_username_label = QLabel()
+            self.sidebar_username_label.setStyleSheet("color: #b388ff; font-size: 12px; font-weight: bold;")
+            profile_layout.addWidget(self.sidebar_username_label)
+            profile_layout.addStretch()
 
-        # Add to sidebar before logout button
-        self.sidebar_layout.insertWidget(self.sidebar_layout.count() - 1, profile_widget)
+            # Add to sidebar before logout button
+            self.sidebar_layout.insertWidget(self.sidebar_layout.count() - 1, profile_widget)
+
+        profile_image = self.data_manager.get_user_profile_image(self.username)
+        self.sidebar_avatar_label.setPixmap(avatar_cache.get(profile_image, 35))
+        self.sidebar_username_label.setText(self.username)
 
     def upload_profile_image(self):
         """Unggah gambar"""
@@ -1283,18 +1104,7 @@ class UserDashboard(QWidget):
 
     def update_account_tab(self):
         """Memperbarui tampilan tab akun"""
-        profile_image = self.data_manager.get_user_profile_image(self.username)
-        
-        if profile_image and os.path.exists(profile_image):
-            pixmap = QPixmap(profile_image)
-            circ = self.make_circular_pixmap(pixmap, 120)
-            self.profile_image_label.setPixmap(circ)
-            self.remove_profile_btn.setVisible(True)
-        else:
-            # Default avatar
-            default = self.create_default_avatar(120)
-            self.profile_image_label.setPixmap(default)
-            self.remove_profile_btn.setVisible(False)
+        self.load_profile_image()
         # Update username label in account tab immediately
         if hasattr(self, 'account_username_label'):
             self.account_username_label.setText(self.username)
@@ -1310,7 +1120,7 @@ class UserDashboard(QWidget):
         
         # Reset state untuk mulai playlist baru
         self.playlist_finished = False
-        self.played_songs.clear()  # Reset track lagu yang sudah diputar
+        self.shuffle = None  # Reset track lagu yang sudah diputar
         
         # Stop current song
         self.stop_song()
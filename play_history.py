@@ -0,0 +1,252 @@
+import bisect
+import glob
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from array import array
+from collections import Counter
+from urllib.parse import quote
+
+# Satu event putar: index lagu, waktu mulai (detik unix), detik didengar.
+# Urutan byte native (tanpa padding) agar kolom bisa dibaca langsung lewat memoryview.cast
+RECORD = struct.Struct("=IIf")
+# Kolom per record saat buffer dibaca sebagai array 4 byte
+_FIELDS = 3
+# Tabel index -> song_id (satu song_id per baris), dipakai bersama semua user
+SONG_TABLE = "songs.txt"
+# Total putar per song index (uint32) dari semua user, agar tidak perlu membaca semua riwayat
+PLAY_COUNTS = "play_counts.dat"
+
+
+class ListenTimer:
+    """Stopwatch waktu mendengarkan satu lagu (waktu jeda tidak dihitung)"""
+
+    def __init__(self):
+        self.started_at = None  # Waktu mulai (detik unix) untuk record history
+        self._elapsed = 0.0
+        self._resumed = None  # time.monotonic() saat terakhir mulai/lanjut; None bila dijeda
+
+    def start(self):
+        self.started_at = time.time()
+        self._elapsed = 0.0
+        self._resumed = time.monotonic()
+
+    def pause(self):
+        if self._resumed is not None:
+            self._elapsed += time.monotonic() - self._resumed
+            self._resumed = None
+
+    def resume(self):
+        if self.started_at is not None and self._resumed is None:
+            self._resumed = time.monotonic()
+
+    def stop(self):
+        """Hentikan stopwatch; kembalikan (waktu mulai, detik didengar) atau None bila belum mulai"""
+        if self.started_at is None:
+            return None
+        self.pause()
+        result = (self.started_at, self._elapsed)
+        self.started_at = None
+        return result
+
+
+class PlayHistory:
+    """Riwayat putar per user dalam file biner append-only berisi record `RECORD`.
+
+    Penulisan dilakukan thread sendiri lewat antrean, jadi pemanggil (thread
+    GUI) tidak pernah menunggu disk. Query membaca file lewat mmap: record
+    terurut waktu sehingga awal rentang dicari dengan bisect, lalu kolom
+    song index dihitung dengan `Counter` langsung di atas memoryview.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.song_table_file = os.path.join(directory, SONG_TABLE)
+        self.song_ids = []  # index -> song_id
+        self.song_numbers = {}  # song_id -> index
+        if os.path.exists(self.song_table_file):
+            with open(self.song_table_file, "rb+") as f:
+                data = f.read()
+                # Baris terakhir yang terpotong (crash saat menulis) dibuang agar song_id
+                # berikutnya tidak tersambung ke sisanya; record untuk baris itu belum ditulis
+                end = data.rfind(b"\n") + 1
+                if end < len(data):
+                    f.truncate(end)
+            for song_id in data[:end].decode("utf-8").splitlines():
+                self._add_song_id(song_id)
+        self.play_counts_file = os.path.join(directory, PLAY_COUNTS)
+        self.play_counts = array("I")  # index -> total putar
+        if os.path.exists(self.play_counts_file):
+            with open(self.play_counts_file, "rb") as f:
+                self.play_counts.frombytes(f.read())
+        else:
+            self._rebuild_play_counts()
+
+        self.commands = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _add_song_id(self, song_id):
+        self.song_numbers[song_id] = len(self.song_ids)
+        self.song_ids.append(song_id)
+
+    def _rebuild_play_counts(self):
+        """Hitung ulang total putar dari semua file riwayat (sekali, bila file counter belum ada)"""
+        counts = Counter()
+        for path in glob.glob(os.path.join(self.directory, "*.bin")):
+            count = os.path.getsize(path) // RECORD.size
+            if not count:
+                continue
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as raw, raw[:count * RECORD.size] as whole, whole.cast("I") as ints:
+                    counts.update(ints[::_FIELDS])
+        self.play_counts = array("I", (counts[index] for index in range(len(self.song_ids))))
+        with open(self.play_counts_file, "wb") as f:
+            self.play_counts.tofile(f)
+
+    def load_play_counts(self):
+        """Total putar per song_id dari semua user (panggil sebelum ada record baru)"""
+        return {self.song_ids[index]: count for index, count in enumerate(self.play_counts) if count}
+
+    def user_file(self, username):
+        """Path file riwayat milik user (username di-escape agar aman sebagai nama file)"""
+        return os.path.join(self.directory, quote(username, safe="") + ".bin")
+
+    # Perintah (aman dipanggil dari thread mana pun)
+    def record(self, username, song_id, seconds, started_at=None):
+        """Catat satu event putar"""
+        started_at = int(started_at if started_at is not None else time.time())
+        self.commands.put(("record", (username, song_id, started_at, seconds)))
+
+    def rename_user(self, old_username, new_username):
+        """Pindahkan riwayat user yang berganti username (setelah record sebelumnya tertulis)"""
+        self.commands.put(("rename", (old_username, new_username)))
+
+    def flush(self):
+        """Tunggu sampai semua perintah yang sudah dikirim selesai ditulis"""
+        self.commands.join()
+
+    def close(self):
+        """Tulis sisa antrean lalu hentikan thread penulis"""
+        if self._thread.is_alive():
+            self.commands.put(("quit", ()))
+            self._thread.join()
+
+    # Thread penulis
+    def _run(self):
+        while True:
+            # Ambil semua perintah yang menumpuk agar ditulis dengan sesedikit mungkin open/write
+            batch = [self.commands.get()]
+            while True:
+                try:
+                    batch.append(self.commands.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                quit_requested = self._process(batch)
+            except Exception as e:
+                # Gagal menulis (mis. disk penuh) tidak boleh mematikan thread: record di batch
+                # ini hilang, tapi perintah berikutnya tetap diproses dan flush() tidak macet
+                print(f"Failed to write play history: {e}")
+                quit_requested = any(command == "quit" for command, _ in batch)
+            finally:
+                for _ in batch:
+                    self.commands.task_done()
+            if quit_requested:
+                return
+
+    def _process(self, batch):
+        """Jalankan satu kumpulan perintah; True bila ada perintah quit"""
+        records = {}  # username -> [(song_id, waktu mulai, detik didengar)]
+        for command, args in batch:
+            if command == "record":
+                username, song_id, started_at, seconds = args
+                records.setdefault(username, []).append((song_id, started_at, seconds))
+            else:
+                # Rename/quit harus terjadi setelah record yang dikirim sebelumnya
+                self._write(records)
+                records = {}
+                if command == "quit":
+                    return True
+                old_path, new_path = (self.user_file(name) for name in args)
+                if os.path.exists(old_path) and not os.path.exists(new_path):
+                    os.replace(old_path, new_path)
+        self._write(records)
+        return False
+
+    def _write(self, records):
+        new_ids = {}
+        for entries in records.values():
+            for song_id, _, _ in entries:
+                if song_id not in self.song_numbers:
+                    new_ids[song_id] = None
+        if new_ids:
+            # Tabel lagu ditulis lebih dulu agar setiap index di file riwayat selalu punya song_id;
+            # index baru dipakai setelah tabel berhasil ditulis
+            with open(self.song_table_file, "a", encoding="utf-8") as f:
+                f.write("".join(song_id + "\n" for song_id in new_ids))
+            for song_id in new_ids:
+                self._add_song_id(song_id)
+
+        touched = set()
+        for username, entries in records.items():
+            data = b"".join(RECORD.pack(self.song_numbers[song_id], started_at, seconds)
+                            for song_id, started_at, seconds in entries)
+            with open(self.user_file(username), "ab") as f:
+                # Record terakhir yang terpotong crash dibuang agar record baru tetap sejajar
+                partial = f.tell() % RECORD.size
+                if partial:
+                    f.truncate(f.tell() - partial)
+                f.write(data)
+            for song_id, _, _ in entries:
+                index = self.song_numbers[song_id]
+                if index >= len(self.play_counts):
+                    self.play_counts.extend([0] * (index + 1 - len(self.play_counts)))
+                self.play_counts[index] += 1
+                touched.add(index)
+
+        if touched:
+            try:
+                # Hanya counter yang berubah yang ditulis ulang (4 byte per lagu)
+                with open(self.play_counts_file, "r+b") as f:
+                    for index in sorted(touched):
+                        f.seek(index * self.play_counts.itemsize)
+                        f.write(self.play_counts[index:index + 1].tobytes())
+            except FileNotFoundError:
+                # File counter hilang: tulis ulang semuanya dari state di memory
+                with open(self.play_counts_file, "wb") as f:
+                    self.play_counts.tofile(f)
+
+    # Query
+    def stats(self, username, days=30, limit=10, now=None):
+        """Statistik `days` hari terakhir: {"plays", "seconds", "top": [(song_id, jumlah putar)]}"""
+        self.flush()
+        result = {"plays": 0, "seconds": 0.0, "top": []}
+        path = self.user_file(username)
+        try:
+            count = os.path.getsize(path) // RECORD.size
+        except OSError:
+            return result
+        if not count:
+            return result
+
+        cutoff = (now if now is not None else time.time()) - days * 86400
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Record terakhir bisa terpotong (mis. aplikasi mati saat menulis); abaikan
+            with memoryview(mm) as raw, raw[:count * RECORD.size] as whole, \
+                    whole.cast("I") as ints, whole.cast("f") as floats:
+                start = bisect.bisect_left(ints[1::_FIELDS], cutoff)
+                plays = Counter(ints[start * _FIELDS::_FIELDS])
+                result["seconds"] = sum(floats[start * _FIELDS + 2::_FIELDS])
+
+        result["plays"] = count - start
+        result["top"] = [(self.song_ids[index], n) for index, n in plays.most_common(limit)]
+        return result
+
+    def top_songs(self, username, days=30, limit=10, now=None):
+        """Lagu yang paling sering diputar user dalam `days` hari terakhir: [(song_id, jumlah putar)]"""
+        return self.stats(username, days, limit, now)["top"]
@@ -0,0 +1,354 @@
+import queue
+import threading
+import time
+import pygame
+from PyQt6.QtCore import QObject, pyqtSignal
+from audio_info import read_duration
+
+# Tipe event pygame yang dikirim mixer saat sebuah lagu selesai diputar
+MUSIC_END_EVENT = pygame.USEREVENT + 1
+# Waktu tunggu (detik) perintah di thread engine sebelum memeriksa event akhir lagu (hanya saat lagu berjalan)
+POLL_INTERVAL = 0.02
+# Jarak (detik) antar pengiriman posisi ke UI
+POSITION_INTERVAL = 0.1
+
+
+def stop_music():
+    """Hentikan musik tanpa menghasilkan event akhir lagu (lagu dihentikan, bukan selesai)"""
+    pygame.mixer.music.set_endevent()
+    pygame.mixer.music.stop()
+    # Buang event akhir lagu sebelumnya yang belum sempat diproses (tanpa pump: bukan thread GUI)
+    pygame.event.clear(MUSIC_END_EVENT, pump=False)
+    pygame.mixer.music.set_endevent(MUSIC_END_EVENT)
+
+
+class PlaybackClock:
+    """Posisi pemutaran lagu (detik) yang dipakai bersama oleh progress, pause, seek dan loop.
+
+    Sumber utamanya `pygame.mixer.music.get_pos()`, yaitu waktu audio yang benar-benar
+    sudah diputar mixer (ikut berhenti saat pause), ditambah offset dari seek.
+    `time.monotonic()` hanya dipakai bila mixer belum bisa melaporkan posisi,
+    jadi perubahan jam sistem tidak berpengaruh.
+    """
+
+    def __init__(self):
+        self.length = 0.0
+        self.looping = False
+        self.offset = 0.0  # Posisi lagu saat get_pos() mixer bernilai 0
+        self.paused_at = None  # Posisi saat dijeda; None bila tidak dijeda
+        self._anchor_pos = 0.0
+        self._anchor_time = time.monotonic()
+
+    @staticmethod
+    def _mixer_seconds():
+        """Waktu (detik) sejak mixer mulai play(), atau None bila tidak tersedia"""
+        ms = pygame.mixer.music.get_pos()
+        return ms / 1000 if ms >= 0 else None
+
+    def _set_anchor(self, position):
+        self._anchor_pos = position
+        self._anchor_time = time.monotonic()
+
+    def _wrap(self, position):
+        """Batasi posisi ke panjang lagu (modulo saat loop)"""
+        if self.length <= 0:
+            return max(0.0, position)
+        if self.looping:
+            return position % self.length
+        return min(max(0.0, position), self.length)
+
+    def reset(self, position=0.0, length=None):
+        """Hitungan get_pos() mixer mulai dari 0: setelah play() atau saat lagu antrean dimulai"""
+        if length is not None:
+            self.length = length
+        self.offset = position
+        self.paused_at = None
+        self._set_anchor(position)
+
+    def seek(self, position):
+        """Lagu dipindah ke `position` (set_pos) sementara hitungan get_pos() tetap berjalan"""
+        self.offset = position - (self._mixer_seconds() or 0.0)
+        if self.paused_at is not None:
+            self.paused_at = self._wrap(position)
+        self._set_anchor(position)
+
+    def pause(self):
+        """Bekukan posisi saat lagu dijeda"""
+        if self.paused_at is None:
+            self.paused_at = self.position()
+
+    def resume(self):
+        """Lanjutkan setelah unpause(); get_pos() ikut berhenti saat pause jadi offset tetap berlaku"""
+        if self.paused_at is not None:
+            self._set_anchor(self.paused_at)
+            self.paused_at = None
+
+    def position(self):
+        """Posisi lagu saat ini (detik)"""
+        if self.paused_at is not None:
+            return self.paused_at
+        mixer = self._mixer_seconds()
+        if mixer is not None:
+            return self._wrap(self.offset + mixer)
+        return self._wrap(self._anchor_pos + time.monotonic() - self._anchor_time)
+
+
+class PlayerEngine(QObject):
+    """Mesin pemutar yang menjalankan semua panggilan pygame mixer di thread sendiri.
+
+    UI mengirim perintah (play, pause, resume, seek, queue, unqueue, set_looping, stop)
+    lewat antrean dan tidak pernah menunggu I/O audio. State dikirim balik lewat
+    signal Qt yang otomatis diteruskan ke thread GUI. Setiap lagu diwakili
+    `token` (mis. `SongNode`) yang ikut dikirim di signal, sehingga UI bisa
+    mengabaikan signal milik lagu yang sudah diganti.
+    """
+    track_started = pyqtSignal(object, float)  # (token, durasi), juga saat lagu antrean mulai
+    track_ended = pyqtSignal(object)  # Token lagu yang selesai tanpa lagu antrean
+    position_changed = pyqtSignal(object, float)  # (token, posisi dalam detik)
+    duration_resolved = pyqtSignal(object, float)  # Durasi yang dihitung engine untuk lagu tanpa metadata
+    error = pyqtSignal(object, str)  # (token, pesan)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        if not pygame.display.get_init():
+            # Antrean event pygame membutuhkan subsistem video (tidak ada jendela yang dibuat)
+            pygame.display.init()
+        pygame.mixer.music.set_endevent(MUSIC_END_EVENT)
+
+        self.commands = queue.Queue()
+        self.clock = PlaybackClock()
+        self.current = None  # (token, file_path) lagu yang sedang dimuat
+        self.queued = None  # (token, file_path, durasi) lagu di antrean mixer
+        self.paused = False
+        self.looping = False
+        self._last_position_time = 0.0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # Perintah dari UI (aman dipanggil dari thread mana pun)
+    def play(self, token, file_path, length=0.0, start=0.0):
+        """Muat dan putar lagu; durasi 0 berarti dihitung oleh engine"""
+        self.commands.put(("play", (token, file_path, length, start)))
+
+    def pause(self):
+        self.commands.put(("pause", ()))
+
+    def resume(self):
+        self.commands.put(("resume", ()))
+
+    def seek(self, position):
+        self.commands.put(("seek", (position,)))
+
+    def queue(self, token, file_path, length=0.0):
+        """Antrekan lagu berikutnya agar diputar tanpa jeda setelah lagu saat ini"""
+        self.commands.put(("queue", (token, file_path, length)))
+
+    def unqueue(self):
+        """Batalkan lagu antrean (mis. lagu itu baru dihapus dari playlist)"""
+        self.commands.put(("unqueue", ()))
+
+    def set_looping(self, looping):
+        self.commands.put(("set_looping", (looping,)))
+
+    def stop(self):
+        self.commands.put(("stop", ()))
+
+    def shutdown(self):
+        """Hentikan musik dan thread engine"""
+        self.commands.put(("quit", ()))
+        self._thread.join(timeout=1)
+
+    # Thread engine
+    def _run(self):
+        while True:
+            try:
+                if self.current is None or self.paused:
+                    # Tidak ada lagu yang berjalan: tidur sampai ada perintah, tanpa polling
+                    command, args = self.commands.get()
+                else:
+                    command, args = self.commands.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                command, args = None, ()
+
+            if command == "quit":
+                stop_music()
+                return
+            # Error apa pun tidak boleh mematikan thread engine; laporkan ke UI lalu lanjut
+            try:
+                if command:
+                    getattr(self, "_do_" + command)(*args)
+                self._check_end()
+                self._publish_position()
+            except (pygame.error, OSError) as e:
+                self.error.emit(self.current[0] if self.current else None, str(e))
+
+    def _loops(self):
+        return -1 if self.looping else 0
+
+    def _resolve_length(self, token, file_path, length):
+        """Durasi dari metadata atau header file; 0 bila harus di-decode dulu.
+
+        Decode penuh lewat `Sound()` bisa memakan waktu lama, jadi dijalankan di
+        thread terpisah dan hasilnya masuk lewat perintah "length".
+        """
+        if length:
+            return length
+        length = read_duration(file_path)
+        if length:
+            self.duration_resolved.emit(token, length)
+        else:
+            threading.Thread(target=self._decode_length, args=(token, file_path), daemon=True).start()
+        return length
+
+    def _decode_length(self, token, file_path):
+        """Decode seluruh file untuk mendapatkan durasinya (di luar thread engine)"""
+        try:
+            length = pygame.mixer.Sound(file_path).get_length()
+        except (pygame.error, OSError):
+            # Format yang bisa diputar mixer tapi tidak bisa di-decode Sound (mis. MIDI)
+            return
+        self.commands.put(("length", (token, length)))
+
+    def _check_end(self):
+        """Tangani event akhir lagu; tanpa pump karena ini bukan thread GUI"""
+        for _ in pygame.event.get(MUSIC_END_EVENT, pump=False):
+            if self.current is None:
+                continue
+            if self.queued and not self.looping:
+                # Mixer sudah berpindah ke lagu antrean dan mengulang get_pos() dari 0
+                token, file_path, length = self.queued
+                self.queued = None
+                self.current = (token, file_path)
+                self.clock.reset(0, length)
+                self.track_started.emit(token, self.clock.length)
+            else:
+                token = self.current[0]
+                self.current = None
+                self.track_ended.emit(token)
+
+    def _publish_position(self):
+        if self.current is None or self.paused:
+            return
+        now = time.monotonic()
+        if now - self._last_position_time >= POSITION_INTERVAL:
+            self._last_position_time = now
+            self.position_changed.emit(self.current[0], self.clock.position())
+
+    def _do_play(self, token, file_path, length, start):
+        stop_music()
+        self.current = None
+        self.queued = None
+        self.paused = False
+        try:
+            pygame.mixer.music.load(file_path)
+            pygame.mixer.music.play(self._loops(), start=start)
+        except (pygame.error, OSError) as e:
+            self.error.emit(token, str(e))
+            return
+        # Durasi dicari setelah lagu berbunyi agar waktu mulai hanya sebatas load mixer
+        self.current = (token, file_path)
+        length = self._resolve_length(token, file_path, length)
+        self.clock.looping = self.looping
+        self.clock.reset(start, length)
+        self.track_started.emit(token, length)
+
+    def _do_pause(self):
+        if self.current and not self.paused:
+            pygame.mixer.music.pause()
+            self.clock.pause()
+            self.paused = True
+
+    def _do_resume(self):
+        # Stream masih dimuat, cukup unpause
+        if self.current and self.paused:
+            pygame.mixer.music.unpause()
+            self.clock.resume()
+            self.paused = False
+
+    def _do_seek(self, position):
+        if not self.current:
+            return
+        try:
+            # Seek langsung di stream yang sedang dimuat (status pause tetap)
+            pygame.mixer.music.set_pos(position)
+            self.clock.seek(position)
+        except pygame.error:
+            # set_pos tidak didukung format ini: putar ulang stream dari posisi tujuan
+            self._restart_at(position)
+
+    def _do_queue(self, token, file_path, length):
+        if not self.current:
+            return
+        try:
+            # Antrean mixer hanya berisi satu lagu; antrean lama otomatis diganti
+            pygame.mixer.music.queue(file_path)
+        except (pygame.error, OSError):
+            # Tidak diantrekan: lagu saat ini berakhir normal dan UI memutarnya lewat play(),
+            # yang melaporkan error bila file memang tidak bisa diputar
+            return
+        # Durasi dihitung sekarang, bukan saat perpindahan lagu
+        self.queued = (token, file_path, self._resolve_length(token, file_path, length))
+
+    def _do_unqueue(self):
+        if not self.queued:
+            return
+        self.queued = None
+        if self.current:
+            # Mixer tidak bisa membatalkan antrean selain lewat stop(); lagu saat ini
+            # lalu diputar ulang dari posisi yang sama
+            position = self.clock.position()
+            stop_music()
+            self._restart_at(position)
+
+    def _do_length(self, token, length):
+        """Durasi hasil decode di background sudah tersedia"""
+        if self.current and self.current[0] is token:
+            self.clock.length = length
+        elif self.queued and self.queued[0] is token:
+            self.queued = self.queued[:2] + (length,)
+        self.duration_resolved.emit(token, length)
+
+    def _do_set_looping(self, looping):
+        # Posisi dibaca dengan mode loop lama (sudah di-modulo bila sebelumnya loop)
+        position = self.clock.position()
+        self.looping = looping
+        self.clock.looping = looping
+        if self.current:
+            # Jumlah loop hanya bisa diubah lewat play()
+            self._restart_at(position)
+
+    def _do_stop(self):
+        stop_music()
+        self.current = None
+        self.queued = None
+        self.paused = False
+        self.clock.reset(0, 0)
+
+    def _restart_at(self, position):
+        """Putar ulang stream yang sudah dimuat mulai dari `position` tanpa membaca ulang file"""
+        try:
+            pygame.mixer.music.play(self._loops(), start=position)
+            self.clock.reset(position)
+        except pygame.error:
+            # Format yang tidak mendukung start= : muat ulang file lalu coba set_pos
+            self._reload_at(position)
+        if self.paused:
+            pygame.mixer.music.pause()
+            self.clock.pause()
+
+    def _reload_at(self, position):
+        """Fallback terakhir: muat ulang file dan putar dari `position` bila didukung"""
+        stop_music()
+        pygame.mixer.music.load(self.current[1])
+        pygame.mixer.music.play(self._loops())
+        self.clock.reset(position)
+        try:
+            pygame.mixer.music.set_pos(position)
+        except pygame.error:
+            # set_pos tidak didukung: lagu diputar dari awal
+            self.clock.reset(0)
+        if self.queued:
+            # stop() mengosongkan antrean mixer
+            pygame.mixer.music.queue(self.queued[1])
@@ -0,0 +1,118 @@
+import math
+from collections import Counter
+
+
+class CoOccurrenceRecommender:
+    """Rekomendasi item-item dari co-occurrence lagu di playlist semua user.
+
+    Matriks co-occurrence disimpan sparse (dict per lagu) dan diperbarui per
+    perubahan playlist, tidak dihitung ulang. Kemiripan dua lagu adalah cosine
+    `bersama / sqrt(frek_a * frek_b)`. Daftar tetangga terurut di-cache per lagu
+    dan hanya dibuang bila baris lagu tersebut berubah, jadi query cukup
+    menelusuri cache sampai ketemu lagu yang belum diputar.
+    """
+
+    def __init__(self):
+        self.counts = {}  # song_id -> Counter {song_id lain: jumlah playlist yang memuat keduanya}
+        self.freq = {}  # song_id -> jumlah playlist yang memuat lagu tsb
+        self._ranked = {}  # song_id -> daftar song_id tetangga, urut dari yang paling mirip
+
+    def add_playlist(self, song_ids):
+        """Masukkan satu playlist utuh (mis. saat membangun dari data yang tersimpan)"""
+        seen = []
+        for song_id in dict.fromkeys(song_ids):
+            self.add_item(seen, song_id)
+            seen.append(song_id)
+
+    def load_playlists(self, playlists):
+        """Bangun matriks dari banyak playlist sekaligus.
+
+        Dipakai saat recommender masih kosong: belum ada cache yang perlu
+        dibuang, jadi setiap pasangan lagu cukup dihitung tanpa `_invalidate`.
+        """
+        counts = self.counts
+        freq = self.freq
+        for playlist in playlists:
+            song_ids = list(dict.fromkeys(playlist))
+            for song_id in song_ids:
+                freq[song_id] = freq.get(song_id, 0) + 1
+                row = counts.get(song_id)
+                if row is None:
+                    row = counts[song_id] = Counter()
+                # Counter.update menghitung di C; pasangan dengan diri sendiri dibuang di akhir
+                row.update(song_ids)
+        for song_id, row in counts.items():
+            row.pop(song_id, None)
+        self._ranked.clear()
+
+    def add_item(self, others, song_id):
+        """`song_id` masuk ke playlist yang sudah berisi `others`"""
+        self.freq[song_id] = self.freq.get(song_id, 0) + 1
+        row = self.counts.setdefault(song_id, Counter())
+        for other in others:
+            if other == song_id:
+                continue
+            row[other] = row.get(other, 0) + 1
+            other_row = self.counts.setdefault(other, Counter())
+            other_row[song_id] = other_row.get(song_id, 0) + 1
+        self._invalidate(song_id)
+
+    def remove_item(self, others, song_id):
+        """`song_id` keluar dari playlist yang masih berisi `others`"""
+        if song_id not in self.freq:
+            return
+        # Frekuensi berubah: skor lagu ini di semua tetangganya ikut berubah
+        self._invalidate(song_id)
+        row = self.counts.get(song_id, {})
+        for other in others:
+            count = row.get(other)
+            if other == song_id or count is None:
+                continue
+            if count > 1:
+                row[other] = count - 1
+                self.counts[other][song_id] -= 1
+            else:
+                del row[other]
+                del self.counts[other][song_id]
+        self.freq[song_id] -= 1
+        if not self.freq[song_id]:
+            del self.freq[song_id]
+            self.counts.pop(song_id, None)
+
+    def remove_playlist(self, song_ids):
+        """Keluarkan satu playlist utuh (mis. saat playlist dikosongkan)"""
+        remaining = list(dict.fromkeys(song_ids))
+        while remaining:
+            song_id = remaining.pop()
+            self.remove_item(remaining, song_id)
+
+    def _invalidate(self, song_id):
+        """Buang cache lagu ini dan tetangganya (skor mereka terhadap lagu ini berubah)"""
+        self._ranked.pop(song_id, None)
+        for other in self.counts.get(song_id, ()):
+            self._ranked.pop(other, None)
+
+    def similarity(self, song_id, other):
+        """Kemiripan cosine dua lagu (0 bila tidak pernah satu playlist)"""
+        count = self.counts.get(song_id, {}).get(other, 0)
+        if not count:
+            return 0.0
+        return count / math.sqrt(self.freq[song_id] * self.freq[other])
+
+    def ranked(self, song_id):
+        """Tetangga `song_id`, urut dari yang paling mirip (di-cache sampai barisnya berubah)"""
+        ranked = self._ranked.get(song_id)
+        if ranked is None:
+            row = self.counts.get(song_id, {})
+            freq = self.freq
+            # sqrt(frek_a) sama untuk semua tetangga, cukup bandingkan count / sqrt(frek_b)
+            ranked = sorted(row, key=lambda other: (-row[other] / math.sqrt(freq[other]), other))
+            self._ranked[song_id] = ranked
+        return ranked
+
+    def recommend(self, song_id, skip=None):
+        """song_id paling mirip dengan `song_id` yang tidak di-`skip`, atau None"""
+        for other in self.ranked(song_id):
+            if skip is None or not skip(other):
+                return other
+        return None
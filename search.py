@@ -0,0 +1,239 @@
+import bisect
+import contextlib
+import heapq
+import re
+
+# Bobot field saat ranking: kecocokan di judul paling relevan
+FIELD_WEIGHTS = {"title": 3, "artist": 2, "genre": 1}
+# Bonus bila token query sama persis dengan token lagu (bukan hanya prefix)
+EXACT_BONUS = 2
+
+# Kemiripan trigram minimal (Jaccard) agar kata dianggap cocok pada fuzzy search
+FUZZY_THRESHOLD = 0.3
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Pecah teks menjadi token huruf kecil (tanda baca dan spasi diabaikan)"""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def normalize_text(text):
+    """Normalisasi teks: huruf kecil, tanda baca/pemisah dibuang, spasi dirapikan.
+
+    Contoh: "Sabrina Carpenter - " dan "sabrina  carpenter" menjadi "sabrina carpenter".
+    """
+    return " ".join(tokenize(text))
+
+
+def trigrams(word):
+    """Himpunan trigram karakter dari satu kata (diberi padding di awal dan akhir)"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Index trigram karakter atas kosakata (kata unik) katalog.
+
+    Dipakai untuk mencari kata yang mirip dengan kata query walau ada typo;
+    karena yang di-index adalah kata unik, ukurannya jauh lebih kecil dari katalog.
+    """
+
+    def __init__(self):
+        self.postings = {}  # trigram -> set kata
+
+    def add_word(self, word):
+        """Index satu kata baru"""
+        for gram in trigrams(word):
+            self.postings.setdefault(gram, set()).add(word)
+
+    def remove_word(self, word):
+        """Hapus kata yang sudah tidak dipakai lagu mana pun"""
+        for gram in trigrams(word):
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.discard(word)
+                if not posting:
+                    del self.postings[gram]
+
+    def similar_words(self, word, threshold=FUZZY_THRESHOLD):
+        """Kembalikan {kata: kemiripan} untuk kata yang kemiripan Jaccard-nya >= threshold"""
+        query_grams = trigrams(word)
+        shared = {}
+        for gram in query_grams:
+            for candidate in self.postings.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        result = {}
+        for candidate, count in shared.items():
+            # Jumlah trigram sebuah kata = panjang kata + 1 (karena padding)
+            similarity = count / (len(query_grams) + len(candidate) + 1 - count)
+            if similarity >= threshold:
+                result[candidate] = similarity
+        return result
+
+
+class FieldIndex:
+    """Index nilai satu field (mis. artist atau genre) ternormalisasi -> lagu.
+
+    Dikunci per node seperti `SearchIndex`; lookup satu nilai O(k) untuk k lagu.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self.groups = {}  # nilai ternormalisasi -> {SongNode: None} (urut sesuai waktu masuk)
+        self.node_keys = {}  # SongNode -> nilai ternormalisasi saat di-index
+
+    def add(self, node):
+        """Index satu lagu"""
+        key = normalize_text(getattr(node, self.field))
+        self.node_keys[node] = key
+        self.groups.setdefault(key, {})[node] = None
+
+    def remove(self, node):
+        """Hapus lagu dari index"""
+        key = self.node_keys.pop(node, None)
+        if key is None:
+            return
+        group = self.groups[key]
+        group.pop(node, None)
+        if not group:
+            del self.groups[key]
+
+    def update(self, node):
+        """Index ulang lagu setelah field-nya berubah"""
+        self.remove(node)
+        self.add(node)
+
+    def get(self, value):
+        """Daftar lagu yang nilai field-nya sama dengan `value` setelah normalisasi"""
+        return list(self.groups.get(normalize_text(value), ()))
+
+    def counts(self):
+        """{nilai: jumlah lagu} per nilai; nama ditampilkan sesuai penulisan lagu pertama"""
+        return {getattr(next(iter(group)), self.field): len(group) for group in self.groups.values()}
+
+    def __len__(self):
+        """Jumlah lagu yang di-index"""
+        return len(self.node_keys)
+
+
+class SearchIndex:
+    """Inverted index token -> {SongNode: bobot} atas title, artist dan genre.
+
+    Daftar token disimpan terurut sehingga query prefix cukup memakai bisect,
+    tanpa menelusuri seluruh katalog per ketikan. Perubahan massal (load,
+    import) dibungkus `bulk()` agar daftar itu diurutkan sekali di akhir.
+    """
+
+    def __init__(self):
+        # Dikunci per node (bukan song_id) karena data lama bisa berisi song_id ganda
+        self.postings = {}  # token -> {SongNode: bobot}
+        self.song_tokens = {}  # SongNode -> {token: bobot}, dipakai saat hapus/update
+        self.vocab = []  # Semua token, terurut (basi selama blok `bulk()`)
+        self.trigrams = TrigramIndex()  # Trigram atas vocab untuk fuzzy search
+        self._bulk_depth = 0
+
+    @contextlib.contextmanager
+    def bulk(self):
+        """Tunda pemeliharaan `vocab` sampai blok terluar selesai, lalu urutkan sekali.
+
+        insort/del per token menggeser seluruh daftar (O(V) per kata baru), jadi
+        load katalog besar menjadi O(V^2). Di dalam blok hanya postings yang
+        diperbarui; query prefix baru benar setelah blok selesai.
+        """
+        self._bulk_depth += 1
+        try:
+            yield self
+        finally:
+            self._bulk_depth -= 1
+            if self._bulk_depth == 0:
+                self.vocab = sorted(self.postings)
+
+    def add(self, node):
+        """Index satu lagu"""
+        tokens = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(getattr(node, field)):
+                tokens[token] = max(tokens.get(token, 0), weight)
+
+        self.song_tokens[node] = tokens
+        for token, weight in tokens.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                if not self._bulk_depth:
+                    bisect.insort(self.vocab, token)
+                self.trigrams.add_word(token)
+            posting[node] = weight
+
+    def remove(self, node):
+        """Hapus lagu dari index"""
+        tokens = self.song_tokens.pop(node, None)
+        if not tokens:
+            return
+        for token in tokens:
+            posting = self.postings[token]
+            posting.pop(node, None)
+            if not posting:
+                del self.postings[token]
+                if not self._bulk_depth:
+                    del self.vocab[bisect.bisect_left(self.vocab, token)]
+                self.trigrams.remove_word(token)
+
+    def update(self, node):
+        """Index ulang lagu setelah field-nya berubah"""
+        self.remove(node)
+        self.add(node)
+
+    def _prefix_scores(self, prefix):
+        """Skor per node untuk semua token yang diawali `prefix`"""
+        scores = {}
+        i = bisect.bisect_left(self.vocab, prefix)
+        while i < len(self.vocab) and self.vocab[i].startswith(prefix):
+            token = self.vocab[i]
+            bonus = EXACT_BONUS if token == prefix else 0
+            for node, weight in self.postings[token].items():
+                score = weight + bonus
+                if score > scores.get(node, 0):
+                    scores[node] = score
+            i += 1
+        return scores
+
+    def search(self, query, limit=None):
+        """Cari lagu yang memuat semua token query (sebagai prefix), urut dari skor tertinggi"""
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        result = None
+        for token in dict.fromkeys(query_tokens):
+            scores = self._prefix_scores(token)
+            if result is None:
+                result = scores
+            else:
+                # Semua token harus cocok (AND); iterasi dari himpunan yang lebih kecil
+                small, large = (result, scores) if len(result) <= len(scores) else (scores, result)
+                result = {node: score + large[node] for node, score in small.items() if node in large}
+            if not result:
+                return []
+
+        if limit is None:
+            return sorted(result, key=result.get, reverse=True)
+        return heapq.nlargest(limit, result, key=result.get)
+
+    def fuzzy_search(self, query, limit=10):
+        """Cari lagu berdasarkan kemiripan kata di title/artist, toleran terhadap typo"""
+        scores = {}
+        for word in dict.fromkeys(tokenize(query)):
+            best = {}
+            for token, similarity in self.trigrams.similar_words(word).items():
+                for node, weight in self.postings[token].items():
+                    # Hanya title dan artist; token yang cuma ada di genre diabaikan
+                    if weight >= FIELD_WEIGHTS["artist"] and similarity > best.get(node, 0):
+                        best[node] = similarity
+            for node, similarity in best.items():
+                scores[node] = scores.get(node, 0) + similarity
+
+        return heapq.nlargest(limit, scores, key=scores.get)
@@ -0,0 +1,124 @@
+import random
+from search import normalize_text
+
+
+class LazyShuffle:
+    """Urutan acak Fisher-Yates yang dikocok sedikit demi sedikit saat diambil.
+
+    Tidak ada biaya mengocok di depan; setiap pengambilan hanya satu swap acak.
+    """
+    __slots__ = ("items", "pos", "ready")
+
+    def __init__(self, items):
+        self.items = list(items)
+        self.pos = 0  # Item sebelum pos sudah terpakai
+        self.ready = False  # True bila items[pos] sudah hasil kocokan
+
+    def peek(self, skip):
+        """Item acak berikutnya yang tidak di-`skip`, tanpa mengonsumsinya (hasil stabil).
+
+        Item yang di-skip dibuang dari urutan, sehingga setiap item dilewati
+        paling banyak sekali (amortized O(1) per pengambilan).
+        """
+        items = self.items
+        while self.pos < len(items):
+            if not self.ready:
+                j = random.randrange(self.pos, len(items))
+                items[self.pos], items[j] = items[j], items[self.pos]
+                self.ready = True
+            item = items[self.pos]
+            if not skip(item):
+                return item
+            self.pos += 1
+            self.ready = False
+        return None
+
+
+class ShuffleSession:
+    """Sesi acak tanpa pengulangan atas katalog, dengan prioritas artis yang sama.
+
+    Katalog dibaca sekali saat sesi dibuat; setelah itu memilih lagu berikutnya
+    amortized O(1) dan cek "semua lagu sudah diputar" O(1). Lagu baru
+    dimasukkan lewat `add`, lagu yang dihapus dilewati lewat `is_valid`, dan
+    lagu yang artisnya diedit dipindah bucket lewat `update`.
+    """
+
+    def __init__(self, songs, is_valid=None, songs_by_artist=None):
+        songs = list(songs)
+        # is_valid(song) -> False untuk lagu yang sudah dihapus dari katalog
+        self.is_valid = is_valid
+        # songs_by_artist(artist) -> daftar lagu artis tsb (mis. `DataManager.get_songs_by_artist`);
+        # None berarti tanpa prioritas artis
+        self.songs_by_artist = songs_by_artist
+        self.played = set()  # song_id yang sudah diputar
+        self.unplayed = {song.song_id for song in songs}
+        self.order = LazyShuffle(songs)
+        self._artist_order = {}  # artist ternormalisasi -> LazyShuffle, dibuat saat pertama dipakai
+        self._artist_keys = {}  # SongNode -> bucket artis yang memuatnya (hanya bucket yang sudah dibuat)
+
+    def _skip(self, song):
+        if song.song_id in self.played:
+            return True
+        return self.is_valid is not None and not self.is_valid(song)
+
+    def add(self, song):
+        """Masukkan lagu baru ke sesi (posisinya di urutan acak tetap acak)"""
+        if song.song_id not in self.played:
+            self.unplayed.add(song.song_id)
+        self.order.items.append(song)
+        self._add_to_bucket(song)
+
+    def _add_to_bucket(self, song):
+        key = normalize_text(song.artist)
+        bucket = self._artist_order.get(key)
+        if bucket is not None:
+            bucket.items.append(song)
+            self._artist_keys[song] = key
+
+    def update(self, song):
+        """Field lagu berubah; bila artisnya lain, pindahkan ke bucket artis yang baru.
+
+        Entri di bucket lama tidak dicari, tapi dibuang saat terlewati.
+        """
+        old_key = self._artist_keys.pop(song, None)
+        if old_key != normalize_text(song.artist):
+            self._add_to_bucket(song)
+        else:
+            self._artist_keys[song] = old_key
+
+    def remove(self, song):
+        """Lagu dihapus dari katalog; entrinya di urutan acak dibuang saat terlewati"""
+        self.unplayed.discard(song.song_id)
+
+    def mark_played(self, song):
+        """Catat lagu yang sudah diputar"""
+        self.played.add(song.song_id)
+        self.unplayed.discard(song.song_id)
+
+    def is_played(self, song):
+        """True bila lagu sudah diputar di sesi ini"""
+        return song.song_id in self.played
+
+    def all_played(self):
+        """True bila semua lagu di sesi sudah diputar"""
+        return not self.unplayed
+
+    def next_song(self, artist=None):
+        """Lagu acak berikutnya yang belum diputar, utamakan `artist`; None bila habis.
+
+        Hasilnya stabil sampai lagu tersebut ditandai `mark_played`, jadi lagu
+        yang sudah diantrekan tetap sama saat benar-benar diputar.
+        """
+        if self.all_played():
+            return None
+        if artist is not None and self.songs_by_artist is not None:
+            key = normalize_text(artist)
+            bucket = self._artist_order.get(key)
+            if bucket is None:
+                bucket = self._artist_order[key] = LazyShuffle(self.songs_by_artist(artist))
+                for song in bucket.items:
+                    self._artist_keys[song] = key
+            song = bucket.peek(lambda other: self._skip(other) or self._artist_keys.get(other) != key)
+            if song is not None:
+                return song
+        return self.order.peek(self._skip)
@@ -0,0 +1,469 @@
+import json
+import os
+import shutil
+import sqlite3
+import threading
+from config import (USERS_FILE, SONGS_FILE, DATA_DIR, JOURNAL_FILE, JOURNAL_COMPACT_BYTES,
+                    FLUSH_DELAY, STORAGE_BACKEND, DATABASE_FILE)
+
+# Operasi journal yang mengubah data lagu; sisanya mengubah data user
+SONG_OPS = {"add_song", "update_song", "delete_song"}
+
+
+class JsonStorage:
+    """Penyimpanan berbasis snapshot JSON + journal mutasi append-only.
+
+    Mutasi ditampung di memory dan ditulis ke journal oleh timer di background
+    (debounce `FLUSH_DELAY`), jadi thread GUI tidak pernah menunggu disk.
+    Snapshot songs.json/users.json yang berubah (dirty) ditulis ulang secara
+    atomik saat journal melewati `JOURNAL_COMPACT_BYTES`.
+    """
+
+    lazy_users = False
+
+    def __init__(self, snapshot_provider):
+        # snapshot_provider() -> (songs_data, users_data) dari state di memory
+        self.snapshot_provider = snapshot_provider
+        self.journal_file = JOURNAL_FILE
+        self.old_journal_file = JOURNAL_FILE + ".old"
+        self._journal = None
+        self._journal_size = 0
+        self._pending = []  # Baris journal yang belum ditulis ke disk
+        self._pending_size = 0
+        self._dirty = set()  # "songs" / "users" yang berubah sejak snapshot terakhir
+        self._lock = threading.Lock()  # Melindungi buffer _pending; tidak pernah dipegang saat I/O
+        self._write_lock = threading.Lock()  # Menyerialkan penulisan dan rotasi file journal
+        self._flush_timer = None
+        self._flush_scheduled = False
+        self._compact_thread = None
+        self._ensure_data_files_exist()
+
+    def _ensure_data_files_exist(self):
+        """Buat file JSON jika belum ada"""
+        if not os.path.exists(DATA_DIR):
+            os.makedirs(DATA_DIR)
+
+        if not os.path.exists(USERS_FILE):
+            self._save_json(USERS_FILE, [])
+
+        if not os.path.exists(SONGS_FILE):
+            self._save_json(SONGS_FILE, [])
+
+    def _load_json(self, file_path):
+        """Baca file JSON. Kembalikan list kosong jika file tidak ada atau JSON tidak valid."""
+        try:
+            with open(file_path, 'r', encoding='utf-8-sig') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+        except json.JSONDecodeError:
+            # Simpan salinan file yang rusak agar tidak tertimpa snapshot kosong berikutnya
+            shutil.copyfile(file_path, file_path + ".corrupt")
+            print(f"Corrupt data file, backup saved to {file_path}.corrupt")
+            return []
+
+    def _save_json(self, file_path, data):
+        """Save JSON file secara atomik (temp file + fsync + rename)"""
+        # Pastikan direktori tujuan ada sebelum menulis
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        tmp_path = file_path + ".tmp"
+        # Gunakan 'utf-8-sig' saat menyimpan agar file dapat dibukadengan benar pada berbagai editor di Windows.
+        with open(tmp_path, 'w', encoding='utf-8-sig') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        # Rename bersifat atomik: file lama tetap utuh bila crash sebelum baris ini
+        os.replace(tmp_path, file_path)
+
+    def load_songs(self):
+        """Baca snapshot lagu"""
+        return self._load_json(SONGS_FILE)
+
+    def load_users(self):
+        """Baca snapshot user"""
+        return self._load_json(USERS_FILE)
+
+    def load_user(self, username):
+        """Semua user sudah dimuat oleh `load_users`"""
+        return None
+
+    def load_playlists(self):
+        """Semua playlist sudah dimuat oleh `load_users`"""
+        return []
+
+    def load_playlist_counts(self):
+        """Semua playlist sudah dimuat oleh `load_users`"""
+        return {}
+
+    def needs_migration(self):
+        return False
+
+    def read_journal(self):
+        """Kembalikan daftar (op, data) yang belum masuk snapshot, urut sesuai waktu"""
+        ops = []
+        for path in (self.old_journal_file, self.journal_file):
+            try:
+                with open(path, 'rb+') as f:
+                    data = f.read()
+                    # Baris terakhir bisa terpotong bila aplikasi crash saat menulis; potong file
+                    # sampai baris utuh terakhir agar mutasi berikutnya tidak tersambung ke sisa itu
+                    end = data.rfind(b"\n") + 1
+                    if end < len(data):
+                        f.truncate(end)
+            except FileNotFoundError:
+                continue
+            for line in data[:end].decode('utf-8', errors='replace').splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                ops.append((entry["op"], entry["data"]))
+                self._dirty.add("songs" if entry["op"] in SONG_OPS else "users")
+        self._journal_size = os.path.getsize(self.journal_file) if os.path.exists(self.journal_file) else 0
+        return ops
+
+    def finish_replay(self):
+        """Dipanggil setelah journal di-replay ke memory"""
+        # Journal .old yang tertinggal berarti compaction sebelumnya tidak selesai;
+        # tulis snapshot sekarang agar isinya tidak hilang saat journal dirotasi lagi.
+        if os.path.exists(self.old_journal_file):
+            dirty = self._dirty
+            self._dirty = set()
+            self._write_snapshot(*self.snapshot_provider(), dirty)
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            self._journal_size = 0
+
+    def record(self, op, data):
+        """Tampung satu mutasi; penulisan ke journal digabung dan dilakukan di background"""
+        self.record_many([(op, data)])
+
+    def record_many(self, entries):
+        """Tampung banyak mutasi (op, data) sekaligus dengan satu kali ambil lock dan satu flush"""
+        lines = [json.dumps({"op": op, "data": data}, ensure_ascii=False) + "\n" for op, data in entries]
+        with self._lock:
+            self._pending.extend(lines)
+            self._pending_size += sum(len(line) for line in lines)
+            for op, _ in entries:
+                self._dirty.add("songs" if op in SONG_OPS else "users")
+            need_compact = self._journal_size + self._pending_size >= JOURNAL_COMPACT_BYTES
+
+        if need_compact:
+            self.compact()
+        else:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Mulai timer debounce bila belum ada flush yang dijadwalkan"""
+        with self._lock:
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self._flush_timer = threading.Timer(FLUSH_DELAY, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def flush(self):
+        """Tulis semua mutasi yang tertunda ke journal lalu fsync"""
+        with self._lock:
+            self._flush_scheduled = False
+        self._flush_pending()
+
+    def _flush_pending(self):
+        """Tulis baris tertunda ke journal.
+
+        Buffer ditukar di bawah `_lock`, sedangkan write + fsync hanya memegang
+        `_write_lock`, jadi `record_many` di thread GUI tidak ikut menunggu disk.
+        """
+        with self._write_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                pending, pending_size = self._pending, self._pending_size
+                self._pending = []
+                self._pending_size = 0
+            if self._journal is None:
+                self._journal = open(self.journal_file, 'a', encoding='utf-8')
+            self._journal.write("".join(pending))
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            with self._lock:
+                self._journal_size += pending_size
+
+    def compact(self):
+        """Rotasi journal dan tulis snapshot yang dirty di background thread"""
+        if self._compact_thread and self._compact_thread.is_alive():
+            self._schedule_flush()
+            return
+        if not self._write_lock.acquire(blocking=False):
+            # Journal sedang ditulis di background; compaction dicoba lagi pada mutasi berikutnya
+            self._schedule_flush()
+            return
+
+        # Snapshot diambil di thread pemanggil agar konsisten dengan journal yang dirotasi;
+        # di bawah lock hanya ada close + rename, penulisan ke disk dilakukan di background.
+        try:
+            songs_data, users_data = self.snapshot_provider()
+            with self._lock:
+                pending = self._pending
+                self._pending = []
+                self._pending_size = 0
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+                if os.path.exists(self.journal_file):
+                    os.replace(self.journal_file, self.old_journal_file)
+                self._journal_size = 0
+                dirty = self._dirty
+                self._dirty = set()
+        finally:
+            self._write_lock.release()
+
+        self._compact_thread = threading.Thread(
+            target=self._compact_worker, args=(pending, songs_data, users_data, dirty), daemon=True
+        )
+        self._compact_thread.start()
+
+    def _compact_worker(self, pending, songs_data, users_data, dirty):
+        """Lengkapi journal lama dengan mutasi tertunda, lalu tulis snapshot"""
+        if pending:
+            with open(self.old_journal_file, 'a', encoding='utf-8') as f:
+                f.write("".join(pending))
+                f.flush()
+                os.fsync(f.fileno())
+        self._write_snapshot(songs_data, users_data, dirty)
+
+    def _write_snapshot(self, songs_data, users_data, dirty):
+        """Tulis snapshot yang berubah lalu buang journal yang sudah tercakup"""
+        if "songs" in dirty:
+            self._save_json(SONGS_FILE, songs_data)
+        if "users" in dirty:
+            self._save_json(USERS_FILE, users_data)
+        if os.path.exists(self.old_journal_file):
+            os.remove(self.old_journal_file)
+
+    def close(self):
+        """Flush semua mutasi tertunda dan tunggu compaction yang sedang berjalan"""
+        if self._flush_timer:
+            self._flush_timer.cancel()
+        if self._compact_thread:
+            self._compact_thread.join()
+        self._flush_pending()
+        with self._write_lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+
+class SqliteStorage:
+    """Penyimpanan berbasis SQLite: setiap mutasi menjadi satu penulisan baris.
+
+    Lagu tetap dimuat saat startup (dibutuhkan library dan index), sedangkan
+    user dan playlist-nya baru dibaca saat pertama kali diakses.
+    """
+
+    lazy_users = True
+
+    def __init__(self, snapshot_provider):
+        os.makedirs(DATA_DIR, exist_ok=True)
+        self.conn = sqlite3.connect(DATABASE_FILE)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._fresh = self.conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='songs'"
+        ).fetchone()[0] == 0
+        self._create_schema()
+
+    def _create_schema(self):
+        """Buat tabel dan index bila belum ada"""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS songs (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                song_id TEXT NOT NULL,
+                title TEXT NOT NULL,
+                artist TEXT NOT NULL,
+                genre TEXT NOT NULL,
+                file_path TEXT NOT NULL DEFAULT '',
+                duration REAL NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_songs_song_id ON songs(song_id);
+
+            CREATE TABLE IF NOT EXISTS users (
+                username TEXT PRIMARY KEY,
+                password TEXT NOT NULL,
+                is_admin INTEGER NOT NULL DEFAULT 0,
+                profile_image TEXT NOT NULL DEFAULT ''
+            );
+
+            CREATE TABLE IF NOT EXISTS playlist_entries (
+                username TEXT NOT NULL,
+                song_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (username, song_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_playlist_order ON playlist_entries(username, position);
+        """)
+        # Database dari versi sebelumnya belum punya kolom duration
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(songs)")}
+        if "duration" not in columns:
+            self.conn.execute("ALTER TABLE songs ADD COLUMN duration REAL NOT NULL DEFAULT 0")
+        self.conn.commit()
+
+    def needs_migration(self):
+        """True bila database baru dibuat dan masih ada data JSON lama"""
+        return self._fresh and (os.path.exists(SONGS_FILE) or os.path.exists(USERS_FILE))
+
+    def import_snapshot(self, songs_data, users_data):
+        """Migrasi satu kali dari snapshot JSON (urutan sama dengan file JSON)"""
+        with self.conn:
+            for song in songs_data:
+                self._op_add_song(song)
+            for user in users_data:
+                self._op_register(user)
+        self._fresh = False
+
+    def load_songs(self):
+        """Baca semua lagu dengan urutan yang sama seperti snapshot JSON"""
+        rows = self.conn.execute(
+            "SELECT song_id, title, artist, genre, file_path, duration FROM songs ORDER BY seq"
+        )
+        return [
+            {"song_id": r[0], "title": r[1], "artist": r[2], "genre": r[3], "file_path": r[4],
+             "duration": r[5]}
+            for r in rows
+        ]
+
+    def load_users(self):
+        """User dimuat secara lazy lewat `load_user`"""
+        return []
+
+    def load_user(self, username):
+        """Baca satu user beserta playlist-nya, atau None bila tidak ada"""
+        row = self.conn.execute(
+            "SELECT username, password, is_admin, profile_image FROM users WHERE username = ?",
+            (username,)
+        ).fetchone()
+        if row is None:
+            return None
+        playlist = [r[0] for r in self.conn.execute(
+            "SELECT song_id FROM playlist_entries WHERE username = ? ORDER BY position",
+            (username,)
+        )]
+        return {
+            "username": row[0], "password": row[1], "is_admin": bool(row[2]),
+            "playlist": playlist, "profile_image": row[3]
+        }
+
+    def load_playlists(self):
+        """Baca playlist semua user (daftar song_id per user) tanpa memuat UserNode-nya"""
+        playlists = {}
+        for username, song_id in self.conn.execute(
+            "SELECT username, song_id FROM playlist_entries ORDER BY username, position"
+        ):
+            playlists.setdefault(username, []).append(song_id)
+        return list(playlists.values())
+
+    def load_playlist_counts(self):
+        """Jumlah playlist yang memuat setiap song_id, dihitung oleh SQLite"""
+        return dict(self.conn.execute("SELECT song_id, COUNT(*) FROM playlist_entries GROUP BY song_id"))
+
+    def read_journal(self):
+        """SQLite tidak memakai journal aplikasi"""
+        return []
+
+    def finish_replay(self):
+        pass
+
+    def record(self, op, data):
+        """Terapkan satu mutasi langsung ke database"""
+        with self.conn:
+            getattr(self, "_op_" + op)(data)
+
+    def record_many(self, entries):
+        """Terapkan banyak mutasi (op, data) dalam satu transaksi"""
+        with self.conn:
+            for op, data in entries:
+                getattr(self, "_op_" + op)(data)
+
+    def _op_add_song(self, data):
+        self.conn.execute(
+            "INSERT INTO songs (song_id, title, artist, genre, file_path, duration) VALUES (?, ?, ?, ?, ?, ?)",
+            (data["song_id"], data["title"], data["artist"], data["genre"], data.get("file_path", ""),
+             data.get("duration", 0))
+        )
+
+    def _op_update_song(self, data):
+        # Data lama bisa berisi song_id ganda; yang diubah adalah baris terbaru (sama seperti di memory)
+        for key in ("title", "artist", "genre", "file_path", "duration"):
+            if data.get(key):
+                self.conn.execute(
+                    f"UPDATE songs SET {key} = ? WHERE seq = (SELECT MAX(seq) FROM songs WHERE song_id = ?)",
+                    (data[key], data["song_id"])
+                )
+
+    def _op_delete_song(self, data):
+        self.conn.execute(
+            "DELETE FROM songs WHERE seq = (SELECT MAX(seq) FROM songs WHERE song_id = ?)",
+            (data["song_id"],)
+        )
+
+    def _op_register(self, data):
+        self.conn.execute(
+            "INSERT OR IGNORE INTO users (username, password, is_admin, profile_image) VALUES (?, ?, ?, ?)",
+            (data["username"], data["password"], int(data.get("is_admin", False)), data.get("profile_image", ""))
+        )
+        for item in data.get("playlist", []):
+            song_id = item.get("song_id") if isinstance(item, dict) else item
+            if song_id:
+                self._op_playlist_add({"username": data["username"], "song_id": song_id})
+
+    def _op_playlist_add(self, data):
+        self.conn.execute(
+            "INSERT OR IGNORE INTO playlist_entries (username, song_id, position) "
+            "VALUES (?, ?, COALESCE((SELECT MAX(position) FROM playlist_entries WHERE username = ?), 0) + 1)",
+            (data["username"], data["song_id"], data["username"])
+        )
+
+    def _op_playlist_remove(self, data):
+        self.conn.execute(
+            "DELETE FROM playlist_entries WHERE username = ? AND song_id = ?",
+            (data["username"], data["song_id"])
+        )
+
+    def _op_playlist_clear(self, data):
+        self.conn.execute("DELETE FROM playlist_entries WHERE username = ?", (data["username"],))
+
+    def _op_update_profile_image(self, data):
+        self.conn.execute(
+            "UPDATE users SET profile_image = ? WHERE username = ?",
+            (data["profile_image"], data["username"])
+        )
+
+    def _op_update_password(self, data):
+        self.conn.execute(
+            "UPDATE users SET password = ? WHERE username = ?",
+            (data["password"], data["username"])
+        )
+
+    def _op_update_username(self, data):
+        params = (data["new_username"], data["old_username"])
+        self.conn.execute("UPDATE users SET username = ? WHERE username = ?", params)
+        self.conn.execute("UPDATE playlist_entries SET username = ? WHERE username = ?", params)
+
+    def flush(self):
+        """Setiap mutasi sudah di-commit saat `record`"""
+        self.conn.commit()
+
+    def close(self):
+        """Tutup koneksi database"""
+        if self.conn is not None:
+            self.conn.commit()
+            self.conn.close()
+            self.conn = None
+
+
+def create_storage(snapshot_provider):
+    """Buat backend penyimpanan sesuai `STORAGE_BACKEND` di config"""
+    if STORAGE_BACKEND == "sqlite":
+        return SqliteStorage(snapshot_provider)
+    return JsonStorage(snapshot_provider)
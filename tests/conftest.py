@@ -0,0 +1,45 @@
+import os
+import sys
+
+import pytest
+
+# Test dijalankan dari folder mana pun: pastikan modul aplikasi bisa di-import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+import models  # noqa: E402
+import storage  # noqa: E402
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Arahkan semua file data ke folder sementara"""
+    paths = {
+        "DATA_DIR": str(tmp_path),
+        "SONGS_FILE": str(tmp_path / "songs.json"),
+        "USERS_FILE": str(tmp_path / "users.json"),
+        "JOURNAL_FILE": str(tmp_path / "journal.log"),
+        "DATABASE_FILE": str(tmp_path / "spotipai.db"),
+        "HISTORY_DIR": str(tmp_path / "history"),
+    }
+    # Modul meng-import konstanta config langsung, jadi nilainya diganti di setiap modul
+    for module in (config, storage, models):
+        for name, value in paths.items():
+            if hasattr(module, name):
+                monkeypatch.setattr(module, name, value)
+    return tmp_path
+
+
+@pytest.fixture
+def open_manager(data_dir):
+    """Factory `DataManager` atas `data_dir`; panggil lagi setelah `close()` untuk simulasi restart"""
+    managers = []
+
+    def factory():
+        manager = models.DataManager()
+        managers.append(manager)
+        return manager
+
+    yield factory
+    for manager in managers:
+        manager.close()
@@ -0,0 +1,19 @@
+import config
+
+
+def test_record_after_torn_line_survives_restart(open_manager):
+    dm = open_manager()
+    dm.register("u", "pw")
+    dm.close()
+
+    # Crash saat menulis: baris terakhir journal terpotong tanpa newline
+    with open(config.JOURNAL_FILE, "a", encoding="utf-8") as f:
+        f.write('{"op": "register", "data": {"usern')
+
+    dm = open_manager()
+    dm.register("v", "pw")
+    dm.close()
+
+    dm = open_manager()
+    assert dm.get_user_by_username("u") is not None
+    assert dm.get_user_by_username("v") is not None
@@ -0,0 +1,61 @@
+import os
+import threading
+
+from play_history import RECORD, PlayHistory
+
+NOW = 1_700_000_000
+
+
+def flush(history, timeout=5):
+    """`history.flush()` yang gagal (bukan macet) bila thread penulis sudah mati"""
+    thread = threading.Thread(target=history.flush, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "writer thread stopped processing commands"
+
+
+def test_missing_play_counts_file_does_not_stop_writer(tmp_path):
+    history = PlayHistory(str(tmp_path))
+    history.record("u", "P1", 30.0, NOW)
+    flush(history)
+    os.remove(history.play_counts_file)
+    history.record("u", "P1", 30.0, NOW + 1)
+    flush(history)
+    history.record("u", "P2", 30.0, NOW + 2)
+    flush(history)
+    assert history.stats("u", now=NOW + 2)["plays"] == 3
+    history.close()
+    # File counter ditulis ulang utuh, jadi tidak perlu dihitung ulang saat dibuka lagi
+    assert PlayHistory(str(tmp_path)).load_play_counts() == {"P1": 2, "P2": 1}
+
+
+def test_write_error_keeps_writer_running(tmp_path):
+    history = PlayHistory(str(tmp_path))
+    # Path riwayat berupa folder: menulis record user ini selalu gagal
+    os.mkdir(history.user_file("broken"))
+    history.record("broken", "P1", 30.0, NOW)
+    flush(history)
+    history.record("u", "P1", 30.0, NOW)
+    flush(history)
+    assert history.stats("u", now=NOW)["plays"] == 1
+    history.close()
+
+
+def test_torn_record_is_dropped_before_append(tmp_path):
+    history = PlayHistory(str(tmp_path))
+    history.record("u", "P1", 30.0, NOW)
+    flush(history)
+    history.close()
+    with open(history.user_file("u"), "ab") as f:
+        f.write(RECORD.pack(0, NOW, 1.0)[:5])
+    with open(history.song_table_file, "a", encoding="utf-8") as f:
+        f.write("P")
+
+    history = PlayHistory(str(tmp_path))
+    history.record("u", "P2", 45.0, NOW + 10)
+    flush(history)
+    stats = history.stats("u", now=NOW + 10)
+    history.close()
+    assert stats["plays"] == 2
+    assert stats["seconds"] == 75.0
+    assert sorted(stats["top"]) == [("P1", 1), ("P2", 1)]
@@ -0,0 +1,118 @@
+import random
+
+import pytest
+
+pytest.importorskip("pygame")
+pytest.importorskip("PyQt6")
+
+import player  # noqa: E402
+from player import PlaybackClock  # noqa: E402
+
+# Panjang lagu uji (detik) dan batas selisih posisi yang masih dianggap sinkron
+TRACK_LENGTH = 600.0
+MAX_DRIFT = 0.05
+
+
+class FakeMixer:
+    """Meniru `pygame.mixer.music`: get_pos() menghitung waktu audio sejak play()
+    (berhenti saat pause, tidak di-reset oleh set_pos) dalam milidetik bulat."""
+
+    def __init__(self, length, looping=False):
+        self.length = length
+        self.looping = looping
+        self.now = 1000.0  # Nilai time.monotonic() palsu
+        self.played = 0.0  # Detik audio yang sudah diputar sejak play()
+        self.song_pos = 0.0  # Posisi sebenarnya di dalam lagu
+        self.paused = False
+
+    def get_pos(self):
+        return int(self.played * 1000)
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+        if self.paused:
+            return
+        self.played += seconds
+        self.song_pos += seconds
+        if self.looping:
+            self.song_pos %= self.length
+        else:
+            self.song_pos = min(self.song_pos, self.length)
+
+    def set_pos(self, position):
+        self.song_pos = position
+
+
+@pytest.fixture
+def mixer(monkeypatch):
+    fake = FakeMixer(TRACK_LENGTH)
+    monkeypatch.setattr(player.pygame.mixer.music, "get_pos", fake.get_pos)
+    monkeypatch.setattr(player.time, "monotonic", fake.monotonic)
+    return fake
+
+
+def make_clock(mixer):
+    clock = PlaybackClock()
+    clock.reset(0.0, mixer.length)
+    clock.looping = mixer.looping
+    return clock
+
+
+def test_drift_with_repeated_seeks(mixer):
+    rng = random.Random(17)
+    clock = make_clock(mixer)
+    worst = 0.0
+    while mixer.played < TRACK_LENGTH:
+        mixer.advance(rng.uniform(0.05, 0.25))
+        if rng.random() < 0.1:
+            target = rng.uniform(0.0, TRACK_LENGTH - 1)
+            mixer.set_pos(target)
+            clock.seek(target)
+        worst = max(worst, abs(clock.position() - mixer.song_pos))
+    assert worst < MAX_DRIFT
+
+
+def test_pause_freezes_position(mixer):
+    clock = make_clock(mixer)
+    mixer.advance(42.0)
+    clock.pause()
+    mixer.paused = True
+    frozen = clock.position()
+    mixer.advance(30.0)
+    assert clock.position() == frozen
+
+    # Seek saat dijeda tetap berlaku setelah dilanjutkan
+    mixer.set_pos(100.0)
+    clock.seek(100.0)
+    assert clock.position() == pytest.approx(100.0)
+    mixer.paused = False
+    clock.resume()
+    mixer.advance(5.0)
+    assert abs(clock.position() - mixer.song_pos) < MAX_DRIFT
+
+
+def test_loop_wraps_to_start(mixer):
+    mixer.looping = True
+    clock = make_clock(mixer)
+    mixer.advance(TRACK_LENGTH - 1.0)
+    mixer.set_pos(TRACK_LENGTH - 2.0)
+    clock.seek(TRACK_LENGTH - 2.0)
+    mixer.advance(5.0)
+    assert mixer.song_pos == pytest.approx(3.0)
+    assert abs(clock.position() - mixer.song_pos) < MAX_DRIFT
+
+
+def test_monotonic_fallback_without_mixer_position(mixer, monkeypatch):
+    monkeypatch.setattr(player.pygame.mixer.music, "get_pos", lambda: -1)
+    clock = make_clock(mixer)
+    mixer.advance(12.5)
+    assert clock.position() == pytest.approx(12.5)
+    clock.seek(300.0)
+    mixer.advance(2.0)
+    assert clock.position() == pytest.approx(302.0)
+    clock.pause()
+    mixer.advance(10.0)
+    assert clock.position() == pytest.approx(302.0)
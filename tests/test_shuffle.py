@@ -0,0 +1,31 @@
+import random
+
+from shuffle import ShuffleSession
+
+
+def test_artist_edit_moves_song_between_buckets(open_manager):
+    random.seed(20)
+    dm = open_manager()
+    a1 = dm.get_song_by_id(dm.add_song("A1", "Alpha", "Pop", duration=1))
+    b1 = dm.get_song_by_id(dm.add_song("B1", "Beta", "Pop", duration=1))
+    dm.add_songs({"title": f"G{i}", "artist": "Gamma", "genre": "Pop", "duration": 1} for i in range(50))
+    session = ShuffleSession(dm.get_all_songs(), songs_by_artist=dm.get_songs_by_artist)
+    # Bucket kedua artis sudah dibuat sebelum edit
+    assert session.next_song("Alpha") is a1
+    assert session.next_song("Beta") is b1
+
+    dm.update_song(a1.song_id, artist="Beta")
+    session.update(a1)
+    session.mark_played(b1)
+
+    assert session.next_song("Beta") is a1
+
+
+def test_update_without_artist_change_keeps_single_entry(open_manager):
+    dm = open_manager()
+    song = dm.get_song_by_id(dm.add_song("A1", "Alpha", "Pop", duration=1))
+    session = ShuffleSession(dm.get_all_songs(), songs_by_artist=dm.get_songs_by_artist)
+    assert session.next_song("Alpha") is song
+    dm.update_song(song.song_id, title="A1 (Remaster)")
+    session.update(song)
+    assert session._artist_order["alpha"].items == [song]
@@ -0,0 +1,26 @@
+def test_ids_without_genre_survive_restart(open_manager):
+    dm = open_manager()
+    first = dm.add_song("A", "Artist", "", duration=1)
+    second = dm.add_song("B", "Artist", "", duration=1)
+    dm.register("u", "pw")
+    dm.add_to_playlist("u", first)
+    dm.add_to_playlist("u", second)
+    dm.close()
+
+    dm = open_manager()
+    third = dm.add_song("C", "Artist", "", duration=1)
+    assert third not in (first, second)
+    titles = [song.title for song in dm.get_user_playlist("u")]
+    assert titles == ["A", "B"]
+
+
+def test_ids_follow_prefix_after_genre_edit(open_manager):
+    dm = open_manager()
+    pop = dm.add_song("A", "Artist", "Pop", duration=1)
+    dm.update_song(pop, genre="Rock")
+    # Snapshot memuat genre baru, jadi saat load genre tidak lagi cocok dengan huruf id
+    dm.storage.compact()
+    dm.close()
+
+    dm = open_manager()
+    assert dm.add_song("B", "Artist", "Pop", duration=1) != pop
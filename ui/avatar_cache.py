@@ -0,0 +1,97 @@
+import os
+from collections import OrderedDict
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPixmap, QPainter, QPainterPath, QBrush, QColor
+
+# Jumlah avatar (kombinasi gambar dan ukuran) yang disimpan sebelum yang paling lama tidak dipakai dibuang
+MAX_AVATARS = 32
+
+
+def make_circular_pixmap(pixmap, size):
+    """Membuat pixmap bulat dari gambar persegi"""
+    # Resize to square
+    square_pixmap = pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+                                  Qt.TransformationMode.SmoothTransformation)
+
+    # Create circular pixmap
+    circular = QPixmap(size, size)
+    circular.fill(Qt.GlobalColor.transparent)
+
+    painter = QPainter(circular)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+    # Create circular clipping path
+    path = QPainterPath()
+    path.addEllipse(0, 0, size, size)
+    painter.setClipPath(path)
+
+    # Draw image
+    painter.drawPixmap(0, 0, square_pixmap)
+
+    painter.end()
+
+    return circular
+
+
+def create_default_avatar(size=35):
+    """Membuat avatar bulat default"""
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.GlobalColor.transparent)
+
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+    # Draw circle
+    painter.setBrush(QBrush(QColor("#333")))
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.drawEllipse(0, 0, size, size)
+
+    # Draw avatar icon
+    painter.setPen(QColor("white"))
+    font = painter.font()
+    font.setPointSize(size // 2)
+    painter.setFont(font)
+    painter.drawText(pixmap.rect(), Qt.AlignmentFlag.AlignCenter, "👤")
+
+    painter.end()
+    return pixmap
+
+
+class AvatarCache:
+    """LRU cache avatar bulat yang sudah dirender, dikunci (path, mtime, ukuran).
+
+    Gambar yang diganti di path yang sama punya mtime baru sehingga otomatis
+    dirender ulang; entri lama tergeser keluar oleh LRU.
+    """
+
+    def __init__(self, max_entries=MAX_AVATARS):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (path, mtime, size) -> QPixmap
+
+    def get(self, path, size):
+        """Avatar bulat untuk gambar di `path`, atau avatar default bila gambar tidak ada"""
+        try:
+            key = (path, os.stat(path).st_mtime_ns, size) if path else None
+        except OSError:
+            key = None
+        if key is None:
+            key = (None, 0, size)
+
+        pixmap = self.entries.get(key)
+        if pixmap is not None:
+            self.entries.move_to_end(key)
+            return pixmap
+
+        if key[0] is None:
+            pixmap = create_default_avatar(size)
+        else:
+            source = QPixmap(path)
+            pixmap = make_circular_pixmap(source, size) if not source.isNull() else create_default_avatar(size)
+        self.entries[key] = pixmap
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return pixmap
+
+
+# Dipakai bersama semua dashboard agar avatar tetap ter-cache setelah logout/login
+avatar_cache = AvatarCache()
@@ -0,0 +1,155 @@
+from PyQt6.QtWidgets import QTableView, QStyledItemDelegate, QHeaderView, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPainter
+
+# Ukuran tombol aksi yang digambar delegate
+BUTTON_HEIGHT = 28
+BUTTON_SPACING = 6
+ROW_HEIGHT = 40
+
+
+class SongTableModel(QAbstractTableModel):
+    """Model tabel lagu (Title, Artist, Genre, Action) di atas daftar `SongNode`"""
+    HEADERS = ["Title", "Artist", "Genre", "Action"]
+    FIELDS = ["title", "artist", "genre"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.songs = []
+
+    def set_songs(self, songs):
+        """Ganti seluruh isi tabel"""
+        self.beginResetModel()
+        self.songs = list(songs)
+        self.endResetModel()
+
+    def insert_song(self, row, song):
+        """Sisipkan satu lagu tanpa me-reset model (scroll dan seleksi tetap)"""
+        row = max(0, min(row, len(self.songs)))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.songs.insert(row, song)
+        self.endInsertRows()
+
+    def update_song(self, song):
+        """Gambar ulang baris milik lagu yang field-nya berubah"""
+        row = self.row_of(song)
+        if row >= 0:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+    def remove_song(self, song):
+        """Hapus baris milik satu lagu"""
+        row = self.row_of(song)
+        if row >= 0:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.songs[row]
+            self.endRemoveRows()
+
+    def row_of(self, song):
+        """Baris dari sebuah `SongNode` (-1 bila tidak ada)"""
+        for row, item in enumerate(self.songs):
+            if item is song:
+                return row
+        return -1
+
+    def song_at(self, row):
+        """Dapatkan `SongNode` pada baris tertentu"""
+        return self.songs[row] if 0 <= row < len(self.songs) else None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.songs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.column() >= len(self.FIELDS):
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return getattr(self.songs[index.row()], self.FIELDS[index.column()])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+
+class ActionButtonDelegate(QStyledItemDelegate):
+    """Delegate yang menggambar tombol aksi di kolom Action.
+
+    Tombol hanya digambar untuk baris yang terlihat; tidak ada QWidget atau
+    QPushButton yang dibuat per baris.
+    """
+    clicked = pyqtSignal(int, str)  # (row, action)
+
+    def __init__(self, buttons, button_width, parent=None):
+        super().__init__(parent)
+        self.buttons = buttons  # Daftar (action, label, warna)
+        self.button_width = button_width
+        self.button_font = QFont()
+        self.button_font.setBold(True)
+
+    def _button_rects(self, rect):
+        """Hitung posisi setiap tombol di dalam sel"""
+        top = rect.top() + (rect.height() - BUTTON_HEIGHT) // 2
+        left = rect.left() + BUTTON_SPACING
+        rects = []
+        for _ in self.buttons:
+            rects.append(QRect(left, top, self.button_width, BUTTON_HEIGHT))
+            left += self.button_width + BUTTON_SPACING
+        return rects
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(self.button_font)
+        for (action, label, color), rect in zip(self.buttons, self._button_rects(option.rect)):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(rect, 6, 6)
+            painter.setPen(QColor("white"))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, label)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton):
+            for (action, _, _), rect in zip(self.buttons, self._button_rects(option.rect)):
+                if rect.contains(event.position().toPoint()):
+                    self.clicked.emit(index.row(), action)
+                    return True
+        return super().editorEvent(event, model, option, index)
+
+
+class SongTableView(QTableView):
+    """Tabel lagu virtual: model + delegate tombol aksi, biaya hanya untuk baris yang terlihat"""
+    action_triggered = pyqtSignal(str, object)  # (action, SongNode)
+
+    def __init__(self, buttons, button_width=70, parent=None):
+        super().__init__(parent)
+        self.song_model = SongTableModel(self)
+        self.setModel(self.song_model)
+
+        self.delegate = ActionButtonDelegate(buttons, button_width, self)
+        self.delegate.clicked.connect(self._on_delegate_clicked)
+        self.setItemDelegateForColumn(3, self.delegate)
+
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.setColumnWidth(3, len(buttons) * (button_width + BUTTON_SPACING) + BUTTON_SPACING)
+
+        # Tinggi baris tetap supaya view tidak perlu mengukur setiap baris
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+
+    def set_songs(self, songs):
+        """Tampilkan daftar lagu"""
+        self.song_model.set_songs(songs)
+
+    def _on_delegate_clicked(self, row, action):
+        song = self.song_model.song_at(row)
+        if song:
+            self.action_triggered.emit(action, song)
@@ -67,8 +67,8 @@ def get_stylesheet():
         font-size: 12px;
     }}
 
-    /* TABLE WIDGET */
-    QTableWidget {{
+    /* TABLE VIEW */
+    QTableView {{
         background-color: {COLOR_CARD};
         color: {COLOR_TEXT};
         border: 1px solid {COLOR_ACCENT1};
@@ -76,12 +76,12 @@ def get_stylesheet():
         gridline-color: {COLOR_ACCENT1};
     }}
 
-    QTableWidget::item {{
+    QTableView::item {{
         padding: 5px;
         border: none;
     }}
 
-    QTableWidget::item:selected {{
+    QTableView::item:selected {{
         background-color: {COLOR_ACCENT1};
     }}
 